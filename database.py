@@ -10,6 +10,12 @@ from PyQt6.QtCore import QDate, QTime, QDateTime
 # Database path - can be overridden for testing via environment variable
 _DB_PATH = os.getenv("HEALTH_APP_DB_PATH", "health_app.db")
 
+# Day columns of the single meal_plan row, in table order
+_MEAL_PLAN_COLUMNS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Per-table change counters, bumped after every committed write so widgets can skip reloads when nothing changed
+_table_versions = {"pantry": 0, "shopping_list": 0, "sleep_diary": 0}
+
 
 def get_db_path():
     """
@@ -30,6 +36,49 @@ def set_db_path(path: str):
     """
     global _DB_PATH
     _DB_PATH = path
+    # A different database file means every table may have changed
+    for table in _table_versions:
+        _bump_table_version(table)
+
+
+def _bump_table_version(table: str):
+    """
+    Record that a table has been modified.
+
+    Args:
+        table (str): The name of the table that was written to.
+    """
+    _table_versions[table] += 1
+
+
+def get_pantry_version():
+    """
+    Get the change counter of the pantry table.
+
+    Returns:
+        int: A number that increases every time the pantry table is modified.
+    """
+    return _table_versions["pantry"]
+
+
+def get_shopping_list_version():
+    """
+    Get the change counter of the shopping_list table.
+
+    Returns:
+        int: A number that increases every time the shopping_list table is modified.
+    """
+    return _table_versions["shopping_list"]
+
+
+def get_sleep_diary_version():
+    """
+    Get the change counter of the sleep_diary table.
+
+    Returns:
+        int: A number that increases every time the sleep_diary table is modified.
+    """
+    return _table_versions["sleep_diary"]
 
 
 @contextmanager
@@ -60,6 +109,8 @@ def use_db(mode: str):
 
     conn = sqlite3.connect(_DB_PATH)
     try:
+        # With WAL (set once in init_db) NORMAL only syncs at checkpoints rather than on every commit, and stays crash-safe
+        conn.execute("PRAGMA synchronous=NORMAL")
         cursor = conn.cursor()
         try:
             yield cursor
@@ -79,14 +130,18 @@ def init_db():
     Creates the following tables:
     - foods: Stores food entries with calories and dates
     - exercise: Stores exercise entries with calories burned and dates
+    - sleep_diary: Stores sleep diary entries, indexed by night
     - goals: Stores weight goals, calorie goals, and timeframes
     - meal_plan: Stores meal plans for each day of the week
     - pantry: Stores pantry items with weights
     - shopping_list: Stores shopping list items
     
     Also creates the initial meal_plan row if it doesn't exist.
+    Switches the database to write-ahead logging, which is stored in the file so only needs doing once.
     """
     with use_db("write") as cursor:
+        # WAL lets reads run alongside a write (e.g. background inserts) and avoids a full sync per commit
+        cursor.execute("PRAGMA journal_mode=WAL")
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS foods (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -112,6 +167,8 @@ def init_db():
                 sleep_duration TIME NOT NULL
             )
         """)
+        # Every sleep diary read filters or orders by night, so index it rather than scanning the whole table
+        cursor.execute("CREATE INDEX IF NOT EXISTS ix_sleep_diary_sleep_date ON sleep_diary (sleep_date)")
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS goals (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -554,6 +611,9 @@ def add_sleep_diary_entry(sleep_date: QDate, bedtime: QDateTime, wakeup: QDateTi
         bedtime (QDateTime): The bedtime.
         wakeup (QDateTime): The wakeup time.
         sleep_duration (QTime): The sleep duration.
+
+    Returns:
+        int: The id of the new sleep diary entry.
     """
 
     # Convert QDates and QTimes to DATE and TIME strings.
@@ -565,6 +625,9 @@ def add_sleep_diary_entry(sleep_date: QDate, bedtime: QDateTime, wakeup: QDateTi
 
     with use_db("write") as cursor:
         cursor.execute("INSERT INTO sleep_diary (sleep_date, bedtime, wakeup, sleep_duration) VALUES (?, ?, ?, ?)", (sleep_date_str, bedtime_str, wakeup_str, sleep_duration_str))
+        entry_id = cursor.lastrowid
+    _bump_table_version("sleep_diary")
+    return entry_id
 
 
 def get_sleep_diary_entries(start_qdate: QDate, end_qdate: QDate):
@@ -598,6 +661,23 @@ def delete_sleep_diary_entry(id: int):
     """
     with use_db("write") as cursor:
         cursor.execute("DELETE FROM sleep_diary WHERE id = ?", (id,))
+    _bump_table_version("sleep_diary")
+
+
+def delete_sleep_diary_entries(ids: list):
+    """
+    Delete multiple sleep diary entries from the database in a single statement.
+    
+    Args:
+        ids (list): The ids of the sleep diary entries to delete.
+    """
+    # Avoid opening a write transaction when there is nothing to delete
+    if not ids:
+        return
+    placeholders = ", ".join("?" * len(ids))
+    with use_db("write") as cursor:
+        cursor.execute(f"DELETE FROM sleep_diary WHERE id IN ({placeholders})", ids)
+    _bump_table_version("sleep_diary")
 
 
 def get_earliest_sleep_diary_date():
@@ -633,6 +713,96 @@ def update_sleep_diary_entry(id: int, sleep_date: QDate, bedtime: QDateTime, wak
     sleep_duration_str = sleep_duration.toString("HH:mm")
     with use_db("write") as cursor:
         cursor.execute("UPDATE sleep_diary SET sleep_date = ?, bedtime = ?, wakeup = ?, sleep_duration = ? WHERE id = ?", (sleep_date_str, bedtime_str, wakeup_str, sleep_duration_str, id))
+    _bump_table_version("sleep_diary")
+
+
+def _hhmm_to_seconds_sql(column: str) -> str:
+    """
+    Build the SQL expression converting an "HH:mm" text column to seconds since midnight.
+
+    Args:
+        column (str): The column name.
+
+    Returns:
+        str: The SQL expression.
+    """
+    return f"(CAST(substr({column}, 1, 2) AS INTEGER) * 3600 + CAST(substr({column}, 4, 2) AS INTEGER) * 60)"
+
+
+def _valid_hhmm_sql(column: str) -> str:
+    """
+    Build the SQL condition that is true when an "HH:mm" text column holds a valid time.
+    Older entries can have an empty sleep_duration, which must be skipped rather than averaged as 00:00.
+
+    Args:
+        column (str): The column name.
+
+    Returns:
+        str: The SQL condition.
+    """
+    return f"({column} GLOB '[0-2][0-9]:[0-5][0-9]' AND substr({column}, 1, 2) < '24')"
+
+
+def get_sleep_diary_averages(start_qdate: QDate, end_qdate: QDate):
+    """
+    Get the average bedtime, wakeup time and sleep duration for a given timeframe,
+    for weekday nights, weekend nights and all nights.
+    The sums are done by SQLite so only one row per category comes back rather than every entry.
+    Bedtimes between 00:00 and 06:00 count as the next day (24 hours are added) so late nights
+    average correctly with ones before midnight. Invalid times are left out of that column's average only.
+
+    Args:
+        start_qdate (QDate): The start date.
+        end_qdate (QDate): The end date.
+
+    Returns:
+        dict: Maps "weekday", "weekend" and "all" to an (avg_bedtime_secs, avg_wakeup_secs, avg_duration_secs)
+            tuple, or None if there are no entries in that category. Each average is None if that column
+            has no valid times.
+    """
+    bedtime_secs = _hhmm_to_seconds_sql("bedtime")
+    sums_and_counts = []
+    for column, seconds in (
+        ("bedtime", f"CASE WHEN CAST(substr(bedtime, 1, 2) AS INTEGER) < 6 THEN {bedtime_secs} + 86400 ELSE {bedtime_secs} END"),
+        ("wakeup", _hhmm_to_seconds_sql("wakeup")),
+        ("sleep_duration", _hhmm_to_seconds_sql("sleep_duration")),
+    ):
+        valid = _valid_hhmm_sql(column)
+        sums_and_counts.append(f"SUM(CASE WHEN {valid} THEN {seconds} END), COUNT(CASE WHEN {valid} THEN 1 END)")
+
+    with use_db("read") as cursor:
+        cursor.execute(
+            f"""
+            SELECT
+                CASE
+                    WHEN strftime('%w', sleep_date) IS NULL THEN NULL
+                    WHEN strftime('%w', sleep_date) IN ('0', '6') THEN 'weekend'
+                    ELSE 'weekday'
+                END AS category,
+                {", ".join(sums_and_counts)}
+            FROM sleep_diary
+            WHERE sleep_date BETWEEN ? AND ?
+            GROUP BY category
+            """,
+            (start_qdate.toString("yyyy-MM-dd"), end_qdate.toString("yyyy-MM-dd")),
+        )
+        # Missing sums (no valid times) are treated as 0 so they can be combined into the overall totals
+        totals = {row[0]: tuple(value or 0 for value in row[1:]) for row in cursor.fetchall()}
+
+    # Overall averages are the combined sums over the combined counts, including entries with an invalid date
+    if totals:
+        totals["all"] = tuple(sum(values) for values in zip(*totals.values()))
+
+    averages = {}
+    for category in ("weekday", "weekend", "all"):
+        if category in totals:
+            values = totals[category]
+            averages[category] = tuple(
+                values[i] / values[i + 1] if values[i + 1] else None for i in range(0, len(values), 2)
+            )
+        else:
+            averages[category] = None
+    return averages
 
 
 def get_sleep_duration_totals_for_timeframe(start_date: str, end_date: str):
@@ -695,36 +865,44 @@ def add_pantry_item(item: str, weight: int):
     Args:
         item (str): The item name.
         weight (int): The weight of the item.
+
+    Returns:
+        int: The id of the new pantry item.
     """
     with use_db("write") as cursor:
         cursor.execute("INSERT INTO pantry (item, weight) VALUES (?, ?)", (item, weight))
+        item_id = cursor.lastrowid
+    _bump_table_version("pantry")
+    return item_id
 
 
 def get_pantry_items():
     """
     Get all pantry items from the database.
+    Ordered by id (the rowid alias) so items come back in insertion order without a sort step.
     
     Returns:
         list: A list of tuples containing the pantry items.
     """
     with use_db("read") as cursor:
-        cursor.execute("SELECT id, item, weight FROM pantry")
+        cursor.execute("SELECT id, item, weight FROM pantry ORDER BY id")
         return cursor.fetchall()
 
 
-def delete_pantry_items(selected_items: list):
+def delete_pantry_items(item_ids: list):
     """
     Delete multiple pantry items from the database.
     
     Args:
-        selected_items (list): A list of QListWidgetItem objects with IDs stored in UserRole data.
+        item_ids (list): The ids of the pantry items to delete.
     """
-    from PyQt6.QtCore import Qt
+    # Avoid opening a write transaction when there is nothing to delete
+    if not item_ids:
+        return
+    placeholders = ", ".join("?" * len(item_ids))
     with use_db("write") as cursor:
-        for item in selected_items:
-            item_id = item.data(Qt.ItemDataRole.UserRole)
-            if item_id:
-                cursor.execute("DELETE FROM pantry WHERE id = ?", (item_id,))
+        cursor.execute(f"DELETE FROM pantry WHERE id IN ({placeholders})", item_ids)
+    _bump_table_version("pantry")
 
 
 def clear_pantry():
@@ -733,6 +911,7 @@ def clear_pantry():
     """
     with use_db("write") as cursor:
         cursor.execute("DELETE FROM pantry")
+    _bump_table_version("pantry")
 
 
 def add_shopping_list_item(item: str):
@@ -741,36 +920,58 @@ def add_shopping_list_item(item: str):
     
     Args:
         item (str): The item name.
+
+    Returns:
+        int: The id of the new shopping list item.
     """
     with use_db("write") as cursor:
         cursor.execute("INSERT INTO shopping_list (item) VALUES (?)", (item,))
+        item_id = cursor.lastrowid
+    _bump_table_version("shopping_list")
+    return item_id
+
+
+def add_shopping_list_items(items: list):
+    """
+    Add several shopping list items to the database in a single transaction.
+    
+    Args:
+        items (list): The item names.
+    """
+    if not items:
+        return
+    with use_db("write") as cursor:
+        cursor.executemany("INSERT INTO shopping_list (item) VALUES (?)", [(item,) for item in items])
+    _bump_table_version("shopping_list")
 
 
 def get_shopping_list_items():
     """
     Get all shopping list items from the database.
+    Ordered by id (the rowid alias) so items come back in insertion order without a sort step.
     
     Returns:
         list: A list of tuples containing the shopping list items.
     """
     with use_db("read") as cursor:
-        cursor.execute("SELECT id, item FROM shopping_list")
+        cursor.execute("SELECT id, item FROM shopping_list ORDER BY id")
         return cursor.fetchall()
 
 
-def delete_shopping_list_items(selected_items: list):
+def delete_shopping_list_items(item_ids: list):
     """
     Delete multiple shopping list items from the database.
     
     Args:
-        selected_items (list): A list of QListWidgetItem objects with IDs stored in UserRole data.
+        item_ids (list): The ids of the shopping list items to delete.
     """
-    from PyQt6.QtCore import Qt
+    # Avoid opening a write transaction when there is nothing to delete
+    if not item_ids:
+        return
+    placeholders = ", ".join("?" * len(item_ids))
     with use_db("write") as cursor:
-        for item in selected_items:
-            item_id = item.data(Qt.ItemDataRole.UserRole)
-            if item_id:
-                cursor.execute("DELETE FROM shopping_list WHERE id = ?", (item_id,))
+        cursor.execute(f"DELETE FROM shopping_list WHERE id IN ({placeholders})", item_ids)
+    _bump_table_version("shopping_list")
 
 
 def clear_shopping_list():
@@ -779,6 +980,7 @@ def clear_shopping_list():
     """
     with use_db("write") as cursor:
         cursor.execute("DELETE FROM shopping_list")
+    _bump_table_version("shopping_list")
 
 
 def clean_shopping_list_formatting():
@@ -834,6 +1036,7 @@ def clean_shopping_list_formatting():
                 cleaned = clean_item_text(item_text)
                 if cleaned != item_text:
                     cursor.execute("UPDATE shopping_list SET item = ? WHERE id = ?", (cleaned, item_id))
+    _bump_table_version("shopping_list")
 
 #---------------------------------------------------------------------------------
 
@@ -880,4 +1083,27 @@ def get_meal_plan_for_day(day: str):
         cursor.execute(f"SELECT {day} FROM meal_plan")
         row = cursor.fetchone()
         return row[0] if row else None
+
+
+def get_meal_plans_for_days(days: list):
+    """
+    Get the meal plans for several days with a single query.
+    All days live in the same meal_plan row, so one SELECT of every day column
+    replaces a query per day.
+    
+    Args:
+        days (list): The days of the week (database column names) to fetch.
+
+    Returns:
+        dict: Mapping of each requested day to its meal plan, or None if not found.
+    """
+    if not days:
+        return {}
+    with use_db("read") as cursor:
+        cursor.execute(f"SELECT {', '.join(_MEAL_PLAN_COLUMNS)} FROM meal_plan LIMIT 1")
+        row = cursor.fetchone()
+    if not row:
+        return {day: None for day in days}
+    meal_plan_by_day = dict(zip(_MEAL_PLAN_COLUMNS, row))
+    return {day: meal_plan_by_day.get(day) for day in days}
 #---------------------------------------------------------------------------------
\ No newline at end of file
@@ -113,7 +113,7 @@ class HealthApp(QMainWindow):
             QDateEdit:focus {{
                 border-color: {active_dark_green};
             }}
-            QTableWidget {{
+            QTableView {{
                 background-color: {background_dark_gray};
                 color: {white};
                 border: 2px solid {border_gray};
@@ -122,17 +122,16 @@ class HealthApp(QMainWindow):
                 selection-background-color: {active_dark_green};
                 alternate-background-color: {background_dark_gray};
             }}
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 8px;
                 border-bottom: 1px solid {border_gray};
                 background-color: {background_dark_gray};
-                color: {white};
             }}
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {active_dark_green};
                 color: {white};
             }}
-            QTableWidget::item:alternate {{
+            QTableView::item:alternate {{
                 background-color: {background_dark_gray};
             }}
             QHeaderView {{
@@ -246,13 +245,13 @@ class HealthApp(QMainWindow):
                 padding: 8px 16px;
                 border-radius: 6px;
             }}
-            QListWidget {{
+            QListView {{
                 background-color: {background_dark_gray};
                 color: {white};
                 border: 2px solid {border_gray};
                 border-radius: 6px;
             }}
-            QListWidget::item {{
+            QListView::item {{
                 padding: 8px;
             }}
             QScrollBar:vertical {{
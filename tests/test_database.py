@@ -3,7 +3,7 @@ Unit tests for database operations.
 """
 import pytest
 from database import (
-    add_food, get_food_entries, update_food_entry, delete_food_entry, get_all_distinct_foods,
+    use_db, add_food, get_food_entries, update_food_entry, delete_food_entry, get_all_distinct_foods,
     get_most_common_foods, get_earliest_food_date, get_food_calorie_totals_for_timeframe,
     add_exercise, get_exercise_entries, delete_exercise_entry, update_exercise_entry,
     get_exercise_calorie_totals_for_timeframe,
@@ -12,15 +12,43 @@ from database import (
     add_daily_calorie_goal, get_daily_calorie_goal,
     check_weekly_weight_entry, delete_weight_entry, update_weight_entry,
     add_pantry_item, get_pantry_items, clear_pantry, delete_pantry_items,
-    add_shopping_list_item, get_shopping_list_items, clear_shopping_list, delete_shopping_list_items,
-    clean_shopping_list_formatting,
-    create_meal_plan_row, get_meal_plan_for_day, update_meal_plan_for_day,
-    add_sleep_diary_entry, get_sleep_diary_entries, delete_sleep_diary_entry,
-    update_sleep_diary_entry, get_earliest_sleep_diary_date, get_sleep_duration_totals_for_timeframe
+    add_shopping_list_item, add_shopping_list_items, get_shopping_list_items, clear_shopping_list, delete_shopping_list_items,
+    clean_shopping_list_formatting, get_pantry_version, get_shopping_list_version, get_sleep_diary_version,
+    create_meal_plan_row, get_meal_plan_for_day, update_meal_plan_for_day, get_meal_plans_for_days,
+    add_sleep_diary_entry, get_sleep_diary_entries, delete_sleep_diary_entry, delete_sleep_diary_entries,
+    update_sleep_diary_entry, get_earliest_sleep_diary_date, get_sleep_duration_totals_for_timeframe,
+    get_sleep_diary_averages
 )
 from PyQt6.QtCore import QDate, QTime, QDateTime
 
 
+@pytest.mark.unit
+class TestDatabaseSetup:
+    """Tests for database initialization and connection settings."""
+
+    def test_init_db_enables_wal(self):
+        """Test the database is switched to write-ahead logging."""
+        with use_db("read") as cursor:
+            cursor.execute("PRAGMA journal_mode")
+            assert cursor.fetchone()[0] == "wal"
+
+    def test_sleep_diary_timeframe_queries_use_index(self):
+        """Test that sleep diary timeframe and earliest date queries search the sleep_date index."""
+        with use_db("read") as cursor:
+            for query in (
+                "SELECT * FROM sleep_diary WHERE sleep_date BETWEEN '2024-01-01' AND '2024-01-07'",
+                "SELECT MIN(sleep_date) FROM sleep_diary",
+            ):
+                cursor.execute(f"EXPLAIN QUERY PLAN {query}")
+                assert any("ix_sleep_diary_sleep_date" in row[-1] for row in cursor.fetchall())
+
+    def test_use_db_sets_synchronous_normal(self):
+        """Test connections use NORMAL synchronous mode (1)."""
+        with use_db("read") as cursor:
+            cursor.execute("PRAGMA synchronous")
+            assert cursor.fetchone()[0] == 1
+
+
 @pytest.mark.unit
 class TestFoodOperations:
     """Tests for food-related database operations."""
@@ -188,9 +216,10 @@ class TestPantryOperations:
     
     def test_add_pantry_item(self):
         """Test adding a pantry item."""
-        add_pantry_item("Flour", 500)
+        item_id = add_pantry_item("Flour", 500)
         items = get_pantry_items()
         assert any(item[1] == "Flour" and item[2] == 500 for item in items)
+        assert items[-1][0] == item_id
     
     def test_clear_pantry(self):
         """Test clearing all pantry items."""
@@ -206,9 +235,10 @@ class TestShoppingListOperations:
     
     def test_add_shopping_list_item(self):
         """Test adding a shopping list item."""
-        add_shopping_list_item("Milk")
+        item_id = add_shopping_list_item("Milk")
         items = get_shopping_list_items()
         assert any(item[1] == "Milk" for item in items)
+        assert items[-1][0] == item_id
     
     def test_clear_shopping_list(self):
         """Test clearing all shopping list items."""
@@ -253,6 +283,22 @@ class TestMealPlanOperations:
         update_meal_plan_for_day("Monday", "Test")
         assert get_meal_plan_for_day("Monday") == "Test"
 
+    def test_get_meal_plans_for_days(self):
+        """Test fetching several days at once returns only the requested days."""
+        update_meal_plan_for_day("Monday", "Porridge")
+        update_meal_plan_for_day("Friday", "Pizza")
+        plans = get_meal_plans_for_days(["Friday", "Monday"])
+        assert plans == {"Friday": "Pizza", "Monday": "Porridge"}
+        assert get_meal_plans_for_days([]) == {}
+
+    def test_get_meal_plans_for_days_recreated_row(self):
+        """Test that the single meal plan row is still found after it has been recreated with a new id."""
+        with use_db("write") as cursor:
+            cursor.execute("DELETE FROM meal_plan")
+        create_meal_plan_row()
+        update_meal_plan_for_day("Sunday", "Roast")
+        assert get_meal_plans_for_days(["Sunday"]) == {"Sunday": "Roast"}
+
 
 @pytest.mark.unit
 class TestFoodOperationsEdgeCases:
@@ -426,6 +472,27 @@ class TestGoalsOperationsEdgeCases:
 class TestPantryOperationsEdgeCases:
     """Edge case tests for pantry operations."""
     
+    def test_pantry_version_bumps_on_writes(self):
+        """Test that every pantry write increases the pantry version and reads don't."""
+        start = get_pantry_version()
+        item_id = add_pantry_item("Oats", 500)
+        after_add = get_pantry_version()
+        get_pantry_items()
+        assert get_pantry_version() == after_add > start
+
+        delete_pantry_items([item_id])
+        after_delete = get_pantry_version()
+        clear_pantry()
+        assert get_pantry_version() > after_delete > after_add
+
+    def test_shopping_list_version_independent_of_pantry(self):
+        """Test that pantry writes don't change the shopping list version."""
+        start = get_shopping_list_version()
+        add_pantry_item("Oats", 500)
+        assert get_shopping_list_version() == start
+        add_shopping_list_items(["Eggs", "Milk"])
+        assert get_shopping_list_version() > start
+
     def test_delete_pantry_items(self):
         """Test deleting specific pantry items."""
         add_pantry_item("Item1", 100)
@@ -436,16 +503,7 @@ class TestPantryOperationsEdgeCases:
         item1_id = next(item[0] for item in items if item[1] == "Item1")
         item2_id = next(item[0] for item in items if item[1] == "Item2")
         
-        # Create mock QListWidgetItem objects with UserRole data
-        from PyQt6.QtWidgets import QListWidgetItem
-        from PyQt6.QtCore import Qt
-        
-        mock_items = [
-            type('obj', (object,), {'data': lambda self, role: item1_id if role == Qt.ItemDataRole.UserRole else None})(),
-            type('obj', (object,), {'data': lambda self, role: item2_id if role == Qt.ItemDataRole.UserRole else None})(),
-        ]
-        
-        delete_pantry_items(mock_items)
+        delete_pantry_items([item1_id, item2_id])
         
         remaining_items = get_pantry_items()
         remaining_names = [item[1] for item in remaining_items]
@@ -453,6 +511,20 @@ class TestPantryOperationsEdgeCases:
         assert "Item2" not in remaining_names
         assert "Item3" in remaining_names
     
+    def test_delete_pantry_items_empty_list(self):
+        """Test deleting with no ids leaves the pantry untouched."""
+        add_pantry_item("Item1", 100)
+        delete_pantry_items([])
+        assert len(get_pantry_items()) == 1
+
+    def test_get_pantry_items_ordered_by_id(self):
+        """Test pantry items are returned in insertion (id) order."""
+        for name in ["Zucchini", "Apple", "Milk"]:
+            add_pantry_item(name, 100)
+        items = get_pantry_items()
+        assert [item[1] for item in items] == ["Zucchini", "Apple", "Milk"]
+        assert [item[0] for item in items] == sorted(item[0] for item in items)
+
     def test_get_pantry_items_empty(self):
         """Test getting items from empty pantry."""
         clear_pantry()
@@ -488,15 +560,7 @@ class TestShoppingListOperationsEdgeCases:
         item1_id = next(item[0] for item in items if item[1] == "Item1")
         item2_id = next(item[0] for item in items if item[1] == "Item2")
         
-        # Create mock QListWidgetItem objects
-        from PyQt6.QtCore import Qt
-        
-        mock_items = [
-            type('obj', (object,), {'data': lambda self, role: item1_id if role == Qt.ItemDataRole.UserRole else None})(),
-            type('obj', (object,), {'data': lambda self, role: item2_id if role == Qt.ItemDataRole.UserRole else None})(),
-        ]
-        
-        delete_shopping_list_items(mock_items)
+        delete_shopping_list_items([item1_id, item2_id])
         
         remaining_items = get_shopping_list_items()
         remaining_names = [item[1] for item in remaining_items]
@@ -504,6 +568,19 @@ class TestShoppingListOperationsEdgeCases:
         assert "Item2" not in remaining_names
         assert "Item3" in remaining_names
     
+    def test_add_shopping_list_items(self):
+        """Test adding several shopping list items at once keeps their order."""
+        add_shopping_list_items(["Eggs", "Flour", "Butter"])
+        items = get_shopping_list_items()
+        assert [item[1] for item in items] == ["Eggs", "Flour", "Butter"]
+
+    def test_get_shopping_list_items_ordered_by_id(self):
+        """Test shopping list items are returned in insertion (id) order."""
+        for name in ["Zucchini", "Apple", "Milk"]:
+            add_shopping_list_item(name)
+        items = get_shopping_list_items()
+        assert [item[1] for item in items] == ["Zucchini", "Apple", "Milk"]
+
     def test_get_shopping_list_items_empty(self):
         """Test getting items from empty shopping list."""
         clear_shopping_list()
@@ -600,6 +677,24 @@ class TestTimeframeOperations:
 class TestSleepDiaryOperations:
     """Tests for sleep diary database operations."""
     
+    def test_sleep_diary_version_bumps_on_writes(self):
+        """Test that adding, updating and deleting entries each increase the sleep diary version."""
+        sleep_date = QDate(2024, 1, 15)
+        bedtime = QDateTime(sleep_date, QTime(22, 30))
+        wakeup = QDateTime(sleep_date.addDays(1), QTime(7, 0))
+        versions = [get_sleep_diary_version()]
+
+        add_sleep_diary_entry(sleep_date, bedtime, wakeup, QTime(8, 30))
+        versions.append(get_sleep_diary_version())
+        entry_id = get_sleep_diary_entries(sleep_date, sleep_date)[0][0]
+        versions.append(get_sleep_diary_version())
+        update_sleep_diary_entry(entry_id, sleep_date, bedtime, wakeup, QTime(8, 0))
+        versions.append(get_sleep_diary_version())
+        delete_sleep_diary_entry(entry_id)
+        versions.append(get_sleep_diary_version())
+
+        assert versions[0] < versions[1] == versions[2] < versions[3] < versions[4]
+
     def test_add_sleep_diary_entry(self):
         """Test adding a sleep diary entry."""
         sleep_date = QDate(2024, 1, 15)
@@ -749,11 +844,74 @@ class TestSleepDiaryOperations:
             assert isinstance(duration_hours, float)
             assert duration_hours > 0
 
+    def test_get_sleep_diary_averages(self):
+        """Test weekday, weekend and overall averages, with after-midnight bedtimes counted as the next day."""
+        monday = QDate(2024, 1, 15)
+        saturday = QDate(2024, 1, 20)
+        # Weekday nights: 23:00 -> 07:00 and 01:00 -> 07:00
+        add_sleep_diary_entry(monday, QDateTime(monday, QTime(23, 0)), QDateTime(monday.addDays(1), QTime(7, 0)), QTime(8, 0))
+        add_sleep_diary_entry(monday.addDays(1), QDateTime(monday.addDays(2), QTime(1, 0)), QDateTime(monday.addDays(2), QTime(7, 0)), QTime(6, 0))
+        # Weekend night: 00:30 -> 10:30
+        add_sleep_diary_entry(saturday, QDateTime(saturday.addDays(1), QTime(0, 30)), QDateTime(saturday.addDays(1), QTime(10, 30)), QTime(10, 0))
+
+        averages = get_sleep_diary_averages(monday, saturday)
+
+        # Weekday bedtime averages 23:00 and 25:00 (01:00 next day) to 24:00
+        assert averages["weekday"] == (24 * 3600, 7 * 3600, 7 * 3600)
+        assert averages["weekend"] == (24.5 * 3600, 10.5 * 3600, 10 * 3600)
+        # Overall: bedtimes 23:00, 25:00, 24:30 -> 24:10; wakeups 07:00, 07:00, 10:30 -> 08:10
+        assert averages["all"] == (24 * 3600 + 600, 8 * 3600 + 600, 8 * 3600)
+
+    def test_get_sleep_diary_averages_skips_invalid_times(self):
+        """Test that an entry with an empty sleep duration is left out of the duration average only."""
+        monday = QDate(2024, 1, 15)
+        add_sleep_diary_entry(monday, QDateTime(monday, QTime(23, 0)), QDateTime(monday.addDays(1), QTime(7, 0)), QTime(8, 0))
+        # An invalid QTime is saved as an empty string, as older versions did when wakeup was before bedtime
+        add_sleep_diary_entry(monday.addDays(1), QDateTime(monday.addDays(1), QTime(23, 0)), QDateTime(monday.addDays(1), QTime(9, 0)), QTime())
+
+        averages = get_sleep_diary_averages(monday, monday.addDays(1))
+
+        assert averages["weekday"] == (23 * 3600, 8 * 3600, 8 * 3600)
+        assert averages["weekend"] is None
+        assert averages["all"] == averages["weekday"]
+
+    def test_get_sleep_diary_averages_no_valid_durations(self):
+        """Test that a column with no valid times averages to None while the others are still returned."""
+        saturday = QDate(2024, 1, 20)
+        add_sleep_diary_entry(saturday, QDateTime(saturday, QTime(23, 0)), QDateTime(saturday, QTime(9, 0)), QTime())
+
+        averages = get_sleep_diary_averages(saturday, saturday)
+
+        assert averages["weekend"] == (23 * 3600, 9 * 3600, None)
+
+    def test_get_sleep_diary_averages_empty(self):
+        """Test that every category is None when there are no entries in the timeframe."""
+        averages = get_sleep_diary_averages(QDate(2024, 1, 1), QDate(2024, 1, 7))
+        assert averages == {"weekday": None, "weekend": None, "all": None}
+
 
 @pytest.mark.unit
 class TestSleepDiaryOperationsEdgeCases:
     """Edge case tests for sleep diary operations."""
     
+    def test_delete_sleep_diary_entries(self):
+        """Test deleting several sleep diary entries at once, leaving the others."""
+        night = QDate(2024, 1, 15)
+        for offset in range(3):
+            date = night.addDays(offset)
+            add_sleep_diary_entry(date, QDateTime(date, QTime(22, 0)), QDateTime(date.addDays(1), QTime(6, 0)), QTime(8, 0))
+        ids = [entry[0] for entry in get_sleep_diary_entries(night, night.addDays(2))]
+
+        delete_sleep_diary_entries(ids[:2])
+
+        assert [entry[0] for entry in get_sleep_diary_entries(night, night.addDays(2))] == ids[2:]
+
+    def test_delete_sleep_diary_entries_empty(self):
+        """Test that deleting an empty list of ids does nothing."""
+        version = get_sleep_diary_version()
+        delete_sleep_diary_entries([])
+        assert get_sleep_diary_version() == version
+
     def test_get_sleep_diary_entries_empty_range(self):
         """Test getting entries for a date range with no entries."""
         start_date = QDate(2024, 12, 31)
@@ -3,7 +3,8 @@ Tests for utility functions.
 """
 import pytest
 from unittest.mock import Mock, patch
-from utils import AIWorker
+from PyQt6.QtCore import QDate
+from utils import AIWorker, BackgroundWorker, time_to_seconds, get_timeframe_dates
 
 
 @pytest.mark.unit
@@ -75,3 +76,72 @@ class TestAIWorker:
 
         # API should still be called (empty string is valid input)
         mock_client.chat.completions.create.assert_called_once()
+
+
+@pytest.mark.unit
+class TestBackgroundWorker:
+    """Tests for BackgroundWorker class."""
+
+    def test_background_worker_success(self):
+        """Test the function's return value is emitted on success."""
+        worker = BackgroundWorker(lambda a, b=0: a + b, 2, b=3)
+        results = []
+        worker.finished.connect(results.append)
+
+        worker.run()
+
+        assert results == [5]
+
+    def test_background_worker_error(self):
+        """Test an exception raised by the function is emitted as an error."""
+        def fail():
+            raise RuntimeError("disk full")
+
+        worker = BackgroundWorker(fail)
+        errors = []
+        worker.error.connect(errors.append)
+
+        worker.run()
+
+        assert errors == ["Error: disk full"]
+
+
+@pytest.mark.unit
+class TestTimeToSeconds:
+    """Tests for time_to_seconds."""
+
+    @pytest.mark.parametrize("time_str, expected", [("00:00", 0), ("07:30", 27000), ("23:59", 86340), ("25:00", None), ("", None)])
+    def test_time_to_seconds(self, time_str, expected):
+        """Test converting HH:mm strings to seconds, with None for invalid times."""
+        assert time_to_seconds(time_str) == expected
+
+
+@pytest.mark.unit
+class TestGetTimeframeDates:
+    """Tests for get_timeframe_dates."""
+
+    @pytest.mark.parametrize("timeframe, expected_start", [
+        ("1 Week", lambda today: today.addDays(-6)),
+        ("2 Weeks", lambda today: today.addDays(-13)),
+        ("1 Month", lambda today: today.addMonths(-1).addDays(1)),
+        ("3 Months", lambda today: today.addMonths(-3).addDays(1)),
+        ("1 Year", lambda today: today.addYears(-1).addDays(1)),
+        ("Unknown", lambda today: today.addDays(-6)),
+        ("Full History", lambda today: today),
+    ])
+    def test_fixed_timeframes_end_today(self, timeframe, expected_start):
+        """Test the start date of each timeframe when there is no earliest date to clamp to."""
+        today = QDate.currentDate()
+        assert get_timeframe_dates(None, timeframe_str=timeframe) == (expected_start(today), today)
+
+    def test_start_clamped_to_earliest_date(self):
+        """Test that the start date never goes before the earliest available date."""
+        today = QDate.currentDate()
+        earliest = today.addDays(-3)
+        assert get_timeframe_dates(None, lambda: earliest, "1 Year") == (earliest, today)
+        assert get_timeframe_dates(None, lambda: earliest.toString("yyyy-MM-dd"), "Full History") == (earliest, today)
+
+    def test_explicit_end_date(self):
+        """Test that a passed end date is used instead of reading today's date."""
+        end = QDate(2024, 3, 31)
+        assert get_timeframe_dates(None, timeframe_str="1 Week", end_qdate=end) == (QDate(2024, 3, 25), end)
@@ -2,13 +2,22 @@
 GUI tests for PyQt6 widgets.
 """
 import pytest
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QDialog, QDialogButtonBox, QDateTimeEdit, QMessageBox
 from PyQt6.QtCore import Qt, QDate, QTime, QDateTime
+from PyQt6.QtGui import QColor
 from widgets.food_tracker import FoodTracker
 from widgets.exercise_tracker import ExerciseTracker
 from widgets.goals import Goals
 from widgets.sleep_diary import SleepDiary
-from database import add_food, add_sleep_diary_entry, add_exercise
+from widgets.meal_plan import MealPlan
+import widgets.pantry
+import widgets.sleep_diary
+from widgets.pantry import Pantry
+from widgets.item_list_model import ItemListModel
+from widgets.sleep_diary_table_model import SleepDiaryTableModel
+from widgets.settings import Settings
+from config import calories_burned_red, hover_light_green
+from database import add_food, add_sleep_diary_entry, add_exercise, update_meal_plan_for_day, add_pantry_item
 
 
 @pytest.mark.gui
@@ -113,6 +122,378 @@ class TestGoals:
         assert widget.canvas is not None
 
 
+@pytest.mark.gui
+class TestMealPlan:
+    """Tests for MealPlan widget."""
+
+    def test_meal_plan_loads_day_text(self, qtbot):
+        """Test that each DayWidget shows its stored meal plan."""
+        update_meal_plan_for_day("Wednesday", "Soup")
+        widget = MealPlan()
+        qtbot.addWidget(widget)
+
+        assert len(widget.day_widgets) == 7
+        assert widget.day_widgets[2].meal_list.toPlainText() == "Soup"
+        assert widget.day_widgets[0].meal_list.toPlainText().startswith("• Breakfast")
+
+
+@pytest.mark.gui
+class TestItemListModel:
+    """Tests for ItemListModel."""
+
+    def test_set_rows_exposes_text_and_ids(self, qapp):
+        """Test that rows are shown by text and keep their ids."""
+        model = ItemListModel()
+        model.set_rows([(7, "Milk"), (9, "Bread")])
+
+        assert model.rowCount() == 2
+        assert model.data(model.index(1)) == "Bread"
+        assert model.data(model.index(1), Qt.ItemDataRole.UserRole) == 9
+        assert model.item_id(0) == 7
+
+    def test_append_row_inserts_without_reset(self, qapp, qtbot):
+        """Test that appending a row emits rowsInserted and keeps existing rows."""
+        model = ItemListModel()
+        model.set_rows([(1, "Milk")])
+
+        with qtbot.waitSignal(model.rowsInserted):
+            model.append_row((2, "Bread"))
+        assert model.rowCount() == 2
+        assert model.item_id(1) == 2
+
+    def test_set_rows_resets_model(self, qapp, qtbot):
+        """Test that replacing the rows is a single model reset."""
+        model = ItemListModel()
+        model.set_rows([(1, "Old")])
+
+        with qtbot.waitSignal(model.modelReset):
+            model.set_rows([])
+        assert model.rowCount() == 0
+
+
+@pytest.mark.gui
+class TestPantry:
+    """Tests for Pantry widget."""
+
+    def test_pantry_loads_items(self, qtbot):
+        """Test that existing pantry items are shown on creation."""
+        add_pantry_item("Rice", 1000)
+        widget = Pantry()
+        qtbot.addWidget(widget)
+
+        assert widget.pantry_model.rowCount() == 1
+        assert widget.pantry_model.data(widget.pantry_model.index(0)) == "Rice (1000 g)"
+
+    def test_load_pantry_skips_query_when_unchanged(self, qtbot, mocker):
+        """Test that reloading without an intervening write doesn't query the database."""
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        fetch = mocker.spy(widgets.pantry, "get_pantry_items")
+
+        widget.load_pantry()
+        fetch.assert_not_called()
+
+        add_pantry_item("Rice", 1000)
+        widget.load_pantry()
+        fetch.assert_called_once()
+        assert widget.pantry_model.rowCount() == 1
+
+    def test_delete_selected_item_pantry_uses_row_ids(self, qtbot, mocker):
+        """Test that deleting the selected row removes the matching database row."""
+        add_pantry_item("Rice", 1000)
+        add_pantry_item("Beans", 400)
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        mocker.patch("widgets.pantry.QMessageBox.question", return_value=QMessageBox.StandardButton.Yes)
+
+        widget.pantry_items.setCurrentIndex(widget.pantry_model.index(1))
+        widget.delete_selected_item_pantry()
+        qtbot.waitUntil(lambda: widget.pantry_model.rowCount() == 1)
+
+        assert widget.pantry_model.data(widget.pantry_model.index(0)) == "Rice (1000 g)"
+
+    def test_add_entry_pantry_reuses_dialog(self, qtbot, mocker):
+        """Test that the add item dialog is built once and reused with cleared inputs."""
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        mocker.patch.object(QDialog, "exec", return_value=QDialog.DialogCode.Rejected)
+
+        widget.add_entry_pantry()
+        dialog, item_input, _ = widget._add_pantry_dialog
+        item_input.setText("Leftover text")
+        widget.add_entry_pantry()
+
+        assert widget._add_pantry_dialog[0] is dialog
+        assert item_input.text() == ""
+
+    def test_add_entry_shopping_reuses_dialog(self, qtbot, mocker):
+        """Test that the shopping list add item dialog is built once and reused with a cleared input."""
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        mocker.patch.object(QDialog, "exec", return_value=QDialog.DialogCode.Rejected)
+
+        widget.add_entry_shopping()
+        dialog, item_input = widget._add_shopping_dialog
+        item_input.setText("Leftover text")
+        widget.add_entry_shopping()
+
+        assert widget._add_shopping_dialog[0] is dialog
+        assert item_input.text() == ""
+
+    @pytest.mark.parametrize("weight_text, expected", [("250", 250), ("0", 0), ("abc", None), ("", None), ("1.5", None), ("-5", None), ("1,000", None)])
+    def test_add_entry_pantry_weight_validation(self, qtbot, mocker, weight_text, expected):
+        """Test that only whole number weights are saved."""
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        widget._add_pantry_dialog = widget._build_add_pantry_dialog()
+        _, item_input, weight_input = widget._add_pantry_dialog
+
+        def fill_and_accept():
+            item_input.setText("Lentils")
+            weight_input.setText(weight_text)
+            return QDialog.DialogCode.Accepted
+
+        mocker.patch.object(QDialog, "exec", side_effect=fill_and_accept)
+        add_item = mocker.patch("widgets.pantry.add_pantry_item")
+
+        widget.add_entry_pantry()
+
+        if expected is None:
+            add_item.assert_not_called()
+        else:
+            add_item.assert_called_once_with("Lentils", expected)
+            assert widget.pantry_model.data(widget.pantry_model.index(0)) == f"Lentils ({expected} g)"
+
+    def test_add_pantry_dialog_button_tracks_input(self, qtbot):
+        """Test that the Add button is only enabled with an item name and a valid weight."""
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        dialog, item_input, weight_input = widget._build_add_pantry_dialog()
+        add_button = dialog.findChild(QDialogButtonBox).button(QDialogButtonBox.StandardButton.Ok)
+
+        assert not add_button.isEnabled()
+        item_input.setText("Lentils")
+        assert not add_button.isEnabled()
+        weight_input.setText("250")
+        assert add_button.isEnabled()
+        item_input.setText("  ")
+        assert not add_button.isEnabled()
+
+    def test_add_entry_pantry_keeps_main_layout(self, qtbot, mocker):
+        """Test that opening the add item dialog doesn't replace the widget's own layout."""
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        main_layout = widget.layout
+        mocker.patch.object(QDialog, "exec", return_value=QDialog.DialogCode.Rejected)
+
+        widget.add_entry_pantry()
+
+        assert widget.layout is main_layout
+        dialog_layout = widget._add_pantry_dialog[0].layout()
+        assert dialog_layout is not None
+        assert dialog_layout is not main_layout
+
+    def test_generate_shopping_list_fetches_days_in_one_query(self, qtbot, mocker):
+        """Test that the selected days' meal plans are read with a single query and used in the prompt."""
+        update_meal_plan_for_day("Monday", "Pancakes")
+        update_meal_plan_for_day("Sunday", "Roast")
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        options = {"monday": True, "tuesday": False, "sunday": True, "ignore_pantry": True}
+        mocker.patch("widgets.planner_options_dialog.PlannerOptionsDialog.exec", return_value=QDialog.DialogCode.Accepted)
+        mocker.patch("widgets.planner_options_dialog.PlannerOptionsDialog.values", return_value=options)
+        ai_worker = mocker.patch("utils.AIWorker")
+        mocker.patch("utils.threading.Thread")
+        fetch = mocker.spy(widgets.pantry, "get_meal_plans_for_days")
+
+        widget.generate_shopping_list()
+
+        fetch.assert_called_once_with(["Monday", "Sunday"])
+        prompt = ai_worker.call_args.args[0]
+        assert "meal plans: Pancakes\nRoast\nFor your response" in prompt
+
+    def test_parse_shopping_list_response(self):
+        """Test that formatting lines are skipped and list markers are stripped."""
+        response = "\n".join([
+            "### Shopping List",
+            "**Shopping List:**",
+            "- Eggs",
+            "*  Flour ",
+            "• Butter",
+            "---",
+            "===",
+            "-",
+            "ab",
+            "Note: buy organic",
+            "Feel free to swap items",
+            "Tomatoes",
+        ])
+        assert Pantry._parse_shopping_list_response(response) == ["Eggs", "Flour", "Butter", "Tomatoes"]
+
+    def test_parse_shopping_list_response_removes_duplicates(self):
+        """Test that repeated items are kept once, ignoring case, in first-seen order."""
+        response = "- Eggs\n- Milk\n- eggs\n- Bread\n- MILK"
+        assert Pantry._parse_shopping_list_response(response) == ["Eggs", "Milk", "Bread"]
+
+    def test_parse_shopping_list_response_windows_line_endings(self):
+        """Test that Windows line endings don't leave stray characters or keep header lines."""
+        response = "**Shopping List:**\r\n- Eggs\r\n\r\n- Milk\r\n"
+        assert Pantry._parse_shopping_list_response(response) == ["Eggs", "Milk"]
+
+    def test_shopping_list_ai_response_without_items_skips_db(self, mocker):
+        """Test that a response with only formatting lines doesn't write to the database."""
+        add_items = mocker.patch("widgets.pantry.add_shopping_list_items")
+
+        items = Pantry._save_shopping_list_response("### Shopping List\n\n---\n- \n")
+
+        assert items == []
+        add_items.assert_not_called()
+
+    def test_shopping_list_ai_response_saved_in_background(self, qtbot):
+        """Test that the AI response is parsed and saved off the GUI thread, then shown in the list."""
+        widget = Pantry()
+        qtbot.addWidget(widget)
+
+        widget.shopping_list_on_ai_response("**Shopping List:**\n- Eggs\n* Flour\n• Butter\n")
+
+        qtbot.waitUntil(lambda: widget.shopping_list_model.rowCount() == 3)
+        assert [widget.shopping_list_model.data(widget.shopping_list_model.index(i)) for i in range(3)] == ["Eggs", "Flour", "Butter"]
+
+    def test_schedule_load_pantry_coalesces_requests(self, qtbot, mocker):
+        """Test that a burst of reload requests results in a single reload."""
+        widget = Pantry()
+        qtbot.addWidget(widget)
+        load_spy = mocker.spy(widget, "load_pantry")
+        widget.pantry_reload_timer.timeout.disconnect()
+        widget.pantry_reload_timer.timeout.connect(widget.load_pantry)
+
+        add_pantry_item("Oats", 500)
+        for _ in range(5):
+            widget.schedule_load_pantry()
+        qtbot.waitUntil(lambda: not widget.pantry_reload_timer.isActive())
+
+        assert load_spy.call_count == 1
+        assert widget.pantry_model.rowCount() == 1
+
+
+@pytest.mark.gui
+class TestSettings:
+    """Tests for Settings widget."""
+
+    def test_settings_read_once_into_cache(self, qtbot, mocker):
+        """Test that settings are read from QSettings once on construction and reloaded from the cache."""
+        settings = mocker.patch("widgets.settings.QSettings").return_value
+        settings.value.side_effect = lambda key, default, type: key == "food_ai_enabled"
+        widget = Settings()
+        qtbot.addWidget(widget)
+
+        assert widget.cached_settings["food_ai_enabled"] is True
+        assert widget.cached_settings["exercise_ai_enabled"] is False
+        assert widget.food_ai_checkbox.isChecked()
+        assert settings.value.call_count == len(widget.cached_settings)
+
+        widget.load_settings()
+        assert settings.value.call_count == len(widget.cached_settings)
+
+    def test_toggle_saves_only_that_setting(self, qtbot, mocker):
+        """Test that toggling a checkbox writes just its own key to the cache and QSettings."""
+        settings = mocker.patch("widgets.settings.QSettings").return_value
+        settings.value.return_value = False
+        widget = Settings()
+        qtbot.addWidget(widget)
+
+        widget.meal_plan_ai_checkbox.setChecked(True)
+
+        settings.setValue.assert_called_once_with("meal_plan_ai_enabled", True)
+        assert widget.cached_settings == {
+            "startup_enabled": False,
+            "food_ai_enabled": False,
+            "exercise_ai_enabled": False,
+            "silent_notif_enabled": False,
+            "meal_plan_ai_enabled": True,
+        }
+        settings.sync.assert_not_called()
+
+    def test_toggle_burst_syncs_once(self, qtbot, mocker):
+        """Test that several toggles in a row start the sync timer once and flush QSettings once."""
+        settings = mocker.patch("widgets.settings.QSettings").return_value
+        settings.value.return_value = False
+        widget = Settings()
+        qtbot.addWidget(widget)
+        start = mocker.patch.object(widget.sync_timer, "start", wraps=widget.sync_timer.start)
+
+        widget.food_ai_checkbox.setChecked(True)
+        widget.exercise_ai_checkbox.setChecked(True)
+        widget.silent_notif_checkbox.setChecked(True)
+        widget.food_ai_checkbox.setChecked(False)
+
+        start.assert_called_once()
+        assert settings.setValue.call_count == 4
+        qtbot.waitUntil(lambda: settings.sync.called)
+        qtbot.wait(widget.sync_timer.interval() * 2)
+        settings.sync.assert_called_once()
+
+    def test_import_database_copies_in_background(self, qtbot, mocker, tmp_path, monkeypatch):
+        """Test that importing backs up the current database and replaces it off the GUI thread."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "health_app.db").write_bytes(b"old")
+        imported = tmp_path / "imported.db"
+        imported.write_bytes(b"new")
+        widget = Settings()
+        qtbot.addWidget(widget)
+        mocker.patch("widgets.settings.QFileDialog.getOpenFileName", return_value=(str(imported), ""))
+        information = mocker.patch("widgets.settings.QMessageBox.information")
+
+        widget.import_database()
+
+        qtbot.waitUntil(lambda: information.called)
+        assert (tmp_path / "health_app.db").read_bytes() == b"new"
+        assert [p.read_bytes() for p in tmp_path.glob("health_app_backup_*.db")] == [b"old"]
+        assert not widget.import_progress_dialog.isVisible()
+
+    def test_import_database_reports_errors(self, qtbot, mocker, tmp_path, monkeypatch):
+        """Test that a failed import closes the progress dialog and shows a warning."""
+        monkeypatch.chdir(tmp_path)
+        widget = Settings()
+        qtbot.addWidget(widget)
+        mocker.patch("widgets.settings.QFileDialog.getOpenFileName", return_value=(str(tmp_path / "missing.db"), ""))
+        warning = mocker.patch("widgets.settings.QMessageBox.warning")
+
+        widget.import_database()
+
+        qtbot.waitUntil(lambda: warning.called)
+        assert warning.call_args.args[2].startswith("Failed to import database:\n[Errno 2]")
+        assert not widget.import_progress_dialog.isVisible()
+
+
+@pytest.mark.gui
+class TestSleepDiaryTableModel:
+    """Tests for SleepDiaryTableModel."""
+
+    def test_data_formats_cells(self, qapp):
+        """Test that the night is shown as dd-MM-yyyy and the other columns as stored."""
+        model = SleepDiaryTableModel(7 * 3600, 9 * 3600)
+        model.set_rows([(3, "2024-01-15", "22:30", "07:00", "08:30")])
+
+        assert model.rowCount() == 1
+        assert [model.data(model.index(0, column)) for column in range(4)] == ["15-01-2024", "22:30", "07:00", "08:30"]
+        assert model.entry_id(0) == 3
+
+    def test_duration_colour_follows_recommended_range(self, qapp):
+        """Test that durations inside the range are green and outside it are red."""
+        model = SleepDiaryTableModel(7 * 3600, 9 * 3600)
+        model.set_rows([
+            (1, "2024-01-15", "22:00", "06:00", "08:00"),
+            (2, "2024-01-16", "01:00", "06:00", "05:00"),
+        ])
+
+        in_range = model.data(model.index(0, 3), Qt.ItemDataRole.ForegroundRole)
+        out_of_range = model.data(model.index(1, 3), Qt.ItemDataRole.ForegroundRole)
+        assert in_range.color() == QColor(hover_light_green)
+        assert out_of_range.color() == QColor(calories_burned_red)
+        assert model.data(model.index(0, 0), Qt.ItemDataRole.ForegroundRole) is None
+
+
 @pytest.mark.gui
 class TestSleepDiary:
     """Tests for SleepDiary widget."""
@@ -210,6 +591,37 @@ class TestSleepDiary:
         # Should still be at last index
         assert widget.timeframe_selector.currentIndex() == last_index
     
+    def test_navigation_coalesces_reloads(self, qtbot, mocker):
+        """Test that repeated back/next presses result in a single table reload for the final timeframe."""
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        load_spy = mocker.spy(widget, "load_table")
+        widget.table_reload_timer.timeout.disconnect()
+        widget.table_reload_timer.timeout.connect(widget.load_table)
+
+        for _ in range(3):
+            widget.next()
+        widget.back()
+        qtbot.waitUntil(lambda: not widget.table_reload_timer.isActive())
+
+        assert load_spy.call_count == 1
+        assert widget.timeframe_selector.currentIndex() == 2
+
+    def test_navigation_at_boundary_does_not_reload(self, qtbot):
+        """Test that back/next at the first/last timeframe don't schedule a reload, but choosing a timeframe does."""
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+
+        widget.back()
+        assert not widget.table_reload_timer.isActive()
+
+        widget.timeframe_selector.setCurrentText("Full History")
+        assert widget.table_reload_timer.isActive()
+        widget.table_reload_timer.stop()
+
+        widget.next()
+        assert not widget.table_reload_timer.isActive()
+
     def test_get_timeframe_dates(self, qtbot):
         """Test getting timeframe dates."""
         widget = SleepDiary()
@@ -225,6 +637,42 @@ class TestSleepDiary:
         assert isinstance(end_date, QDate)
         assert start_date <= end_date
     
+    def test_timeframe_dates_reused_until_change(self, qtbot, mocker):
+        """Test that the timeframe range is only recomputed when the timeframe or entries change."""
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        earliest = mocker.spy(widgets.sleep_diary, "get_earliest_sleep_diary_date")
+
+        widget.get_timeframe_dates()
+        widget.get_timeframe_dates()
+        earliest.assert_not_called()
+
+        widget.timeframe_selector.setCurrentText("Full History")
+        widget.get_timeframe_dates()
+        sleep_date = QDate.currentDate().addDays(-30)
+        add_sleep_diary_entry(sleep_date, QDateTime(sleep_date, QTime(22, 0)), QDateTime(sleep_date.addDays(1), QTime(6, 0)), QTime(8, 0))
+        assert widget.get_timeframe_dates()[0] == sleep_date
+        # The earliest entry was already read when the widget loaded, so only the new entry queries it again
+        assert earliest.call_count == 1
+
+    def test_earliest_date_reused_across_timeframes(self, qtbot, mocker):
+        """Test that switching timeframe doesn't query the earliest entry again until the entries change."""
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        earliest = mocker.spy(widgets.sleep_diary, "get_earliest_sleep_diary_date")
+
+        for text in ("1 Month", "3 Months", "1 Year", "Full History"):
+            widget.timeframe_selector.setCurrentText(text)
+            widget.get_timeframe_dates()
+        earliest.assert_not_called()
+
+        sleep_date = QDate.currentDate().addDays(-3)
+        add_sleep_diary_entry(sleep_date, QDateTime(sleep_date, QTime(22, 0)), QDateTime(sleep_date.addDays(1), QTime(6, 0)), QTime(8, 0))
+        assert widget.get_timeframe_dates()[0] == sleep_date
+        assert earliest.call_count == 1
+
     def test_load_table_with_entries(self, qtbot):
         """Test loading table with sleep diary entries."""
         widget = SleepDiary()
@@ -242,8 +690,247 @@ class TestSleepDiary:
         widget.load_table()
         
         # Table should have at least one row
-        assert widget.table.rowCount() >= 1
+        assert widget.table_model.rowCount() >= 1
     
+    def test_table_loaded_on_first_show(self, qtbot, mocker):
+        """Test that the table isn't loaded until the page is first shown, and only once."""
+        load_table = mocker.spy(SleepDiary, "load_table")
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        load_table.assert_not_called()
+
+        widget.show()
+        widget.hide()
+        widget.show()
+        load_table.assert_called_once()
+
+    def test_load_table_queries_once_per_change(self, qtbot, mocker):
+        """Test that the table and stats share one query, and a write invalidates the cached entries."""
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        fetch = mocker.spy(widgets.sleep_diary, "get_sleep_diary_entries")
+
+        widget.load_table()
+        fetch.assert_not_called()
+
+        sleep_date = QDate.currentDate()
+        add_sleep_diary_entry(sleep_date, QDateTime(sleep_date, QTime(22, 0)), QDateTime(sleep_date.addDays(1), QTime(6, 0)), QTime(8, 0))
+        widget.load_table()
+        fetch.assert_called_once()
+        assert widget.table_model.rowCount() == 1
+
+    def test_delete_selected_rows_uses_row_ids(self, qtbot, mocker):
+        """Test that deleting the selected table row removes the matching database entry."""
+        sleep_date = QDate.currentDate()
+        for days_ago, hours in ((1, 7), (0, 8)):
+            night = sleep_date.addDays(-days_ago)
+            add_sleep_diary_entry(night, QDateTime(night, QTime(22, 0)), QDateTime(night.addDays(1), QTime(6, 0)), QTime(hours, 0))
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        mocker.patch("widgets.sleep_diary.QMessageBox.question", return_value=QMessageBox.StandardButton.Yes)
+
+        widget.table.selectRow(0)
+        widget.delete_selected_rows_del_key_pressed()
+
+        assert widget.table_model.rowCount() == 1
+        assert widget.table_model.entry(0)[4] == "08:00"
+
+    def test_remove_entry_resolves_id_from_table(self, qtbot, mocker):
+        """Test that removing by row number uses the displayed rows and updates the table without querying."""
+        sleep_date = QDate.currentDate()
+        for days_ago, hours in ((1, 7), (0, 8)):
+            night = sleep_date.addDays(-days_ago)
+            add_sleep_diary_entry(night, QDateTime(night, QTime(22, 0)), QDateTime(night.addDays(1), QTime(6, 0)), QTime(hours, 0))
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        mocker.patch("widgets.sleep_diary.QInputDialog.getInt", return_value=(2, True))
+        fetch = mocker.spy(widgets.sleep_diary, "get_sleep_diary_entries")
+
+        widget.remove_entry_button_clicked()
+
+        fetch.assert_not_called()
+        assert widget.table_model.rowCount() == 1
+        assert widget.table_model.entry(0)[4] == "07:00"
+
+    def test_add_entry_inserts_row_in_order(self, qtbot, mocker):
+        """Test that adding an entry inserts one row in night order without resetting the table."""
+        today = QDate.currentDate()
+        for days_ago in (3, 1):
+            night = today.addDays(-days_ago)
+            add_sleep_diary_entry(night, QDateTime(night, QTime(22, 0)), QDateTime(night.addDays(1), QTime(6, 0)), QTime(8, 0))
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        new_night = today.addDays(-2)
+
+        def fill_and_accept():
+            night_input, bedtime_input, wakeup_input = widget.findChildren(QDialog)[-1].findChildren(QDateTimeEdit)
+            night_input.setDate(new_night)
+            bedtime_input.setDateTime(QDateTime(new_night, QTime(23, 0)))
+            wakeup_input.setDateTime(QDateTime(new_night.addDays(1), QTime(6, 0)))
+            return QDialog.DialogCode.Accepted
+
+        mocker.patch.object(QDialog, "exec", side_effect=fill_and_accept)
+        reset = mocker.Mock()
+        widget.table_model.modelReset.connect(reset)
+
+        widget.add_entry()
+        qtbot.waitUntil(lambda: widget.table_model.rowCount() == 3)
+
+        reset.assert_not_called()
+        assert [entry[1] for entry in widget.table_model.entries()] == [
+            today.addDays(-days_ago).toString("yyyy-MM-dd") for days_ago in (3, 2, 1)
+        ]
+        assert widget.table_model.entry(1)[2:] == ("23:00", "06:00", "07:00")
+        assert "Overall - Average Sleep Duration: 7h 40m" in widget.overall_sleep_duration_label.text()
+
+    @pytest.mark.parametrize("wakeup_hours, expected", [(6, None), (22, None), (30, "08:00"), (46, None), (47, None)])
+    def test_add_entry_rejects_invalid_duration(self, qtbot, mocker, wakeup_hours, expected):
+        """Test that entries are only saved when wakeup is after bedtime and less than a day later."""
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        night = QDate.currentDate()
+
+        def fill_and_accept():
+            _, bedtime_input, wakeup_input = widget.findChildren(QDialog)[-1].findChildren(QDateTimeEdit)
+            bedtime_input.setDateTime(QDateTime(night, QTime(22, 0)))
+            wakeup_input.setDateTime(QDateTime(night, QTime(0, 0)).addSecs(wakeup_hours * 3600))
+            return QDialog.DialogCode.Accepted
+
+        mocker.patch.object(QDialog, "exec", side_effect=fill_and_accept)
+        warning = mocker.patch("widgets.sleep_diary.QMessageBox.warning")
+
+        widget.add_entry()
+
+        if expected is None:
+            warning.assert_called_once()
+            assert widget.table_model.rowCount() == 0
+        else:
+            qtbot.waitUntil(lambda: widget.table_model.rowCount() == 1)
+            warning.assert_not_called()
+            assert widget.table_model.entry(0)[4] == expected
+
+    def test_entry_dialogs_are_reused(self, qtbot, mocker):
+        """Test that the add and edit dialogs are built once and their inputs reset on each use."""
+        night = QDate.currentDate().addDays(-1)
+        add_sleep_diary_entry(night, QDateTime(night, QTime(23, 0)), QDateTime(night.addDays(1), QTime(7, 0)), QTime(8, 0))
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        mocker.patch.object(QDialog, "exec", return_value=QDialog.DialogCode.Rejected)
+
+        widget.add_entry()
+        dialog, _, night_input, bedtime_input, _ = widget._add_entry_dialog
+        night_input.setDate(night.addDays(-5))
+        bedtime_input.setDateTime(QDateTime(night, QTime(20, 0)))
+        widget.add_entry()
+        assert widget._add_entry_dialog[0] is dialog
+        assert night_input.date() == QDate.currentDate()
+        assert bedtime_input.time() == QTime(22, 0)
+
+        widget.table.selectRow(0)
+        widget.edit_entry()
+        edit_dialog, message_label, _, _, wakeup_input = widget._edit_entry_dialog
+        widget.edit_entry()
+        assert widget._edit_entry_dialog[0] is edit_dialog
+        assert edit_dialog is not dialog
+        assert night.toString("yyyy-MM-dd") in message_label.text()
+        assert wakeup_input.dateTime() == QDateTime(night.addDays(1), QTime(7, 0))
+
+    def test_add_entry_saves_in_background(self, qtbot, mocker):
+        """Test that adding an entry saves it off the GUI thread and reports failures."""
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        mocker.patch.object(QDialog, "exec", return_value=QDialog.DialogCode.Accepted)
+        run_in_background = mocker.spy(widgets.sleep_diary, "run_in_background")
+        mocker.patch("widgets.sleep_diary.add_sleep_diary_entry", side_effect=RuntimeError("disk full"))
+        warning = mocker.patch("widgets.sleep_diary.QMessageBox.warning")
+
+        widget.add_entry()
+
+        assert run_in_background.call_args.args[1] == widget._save_entry
+        qtbot.waitUntil(lambda: warning.called)
+        assert warning.call_args.args[2] == "Failed to add sleep entry:\ndisk full"
+        assert widget.table_model.rowCount() == 0
+
+    def test_add_entry_defaults_to_overnight(self, qtbot, mocker):
+        """Test that accepting the add dialog unchanged saves a night from 22:00 to 09:00 the next morning."""
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        mocker.patch.object(QDialog, "exec", return_value=QDialog.DialogCode.Accepted)
+        warning = mocker.patch("widgets.sleep_diary.QMessageBox.warning")
+
+        widget.add_entry()
+        qtbot.waitUntil(lambda: widget.table_model.rowCount() == 1)
+
+        warning.assert_not_called()
+        assert widget.table_model.entry(0)[2:] == ("22:00", "09:00", "11:00")
+
+    def test_edit_entry_moves_row_out_of_timeframe(self, qtbot, mocker):
+        """Test that editing an entry's night to outside the timeframe removes its row."""
+        today = QDate.currentDate()
+        add_sleep_diary_entry(today, QDateTime(today, QTime(22, 0)), QDateTime(today.addDays(1), QTime(6, 0)), QTime(8, 0))
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        widget.table.selectRow(0)
+
+        def move_to_last_month():
+            night_input = widget.findChildren(QDialog)[-1].findChildren(QDateTimeEdit)[0]
+            night_input.setDate(today.addMonths(-1))
+            return QDialog.DialogCode.Accepted
+
+        mocker.patch.object(QDialog, "exec", side_effect=move_to_last_month)
+
+        widget.edit_entry()
+
+        assert widget.table_model.rowCount() == 0
+        assert widget.overall_sleep_duration_label.text() == "Overall - Average Sleep Duration: --h --m"
+
+    def test_stats_style_only_set_when_changed(self, qtbot, mocker):
+        """Test that recalculating the stats doesn't re-apply an unchanged duration colour."""
+        night = QDate.currentDate().addDays(-2)
+        add_sleep_diary_entry(night, QDateTime(night, QTime(22, 0)), QDateTime(night.addDays(1), QTime(6, 0)), QTime(8, 0))
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        label = widget.overall_sleep_duration_label
+        set_style_sheet = mocker.patch.object(label, "setStyleSheet", wraps=label.setStyleSheet)
+
+        night = night.addDays(1)
+        add_sleep_diary_entry(night, QDateTime(night, QTime(23, 0)), QDateTime(night.addDays(1), QTime(7, 0)), QTime(8, 0))
+        widget.load_table()
+        set_style_sheet.assert_not_called()
+
+        night = night.addDays(1)
+        add_sleep_diary_entry(night, QDateTime(night, QTime(23, 0)), QDateTime(night.addDays(1), QTime(2, 0)), QTime(3, 0))
+        widget.load_table()
+        set_style_sheet.assert_called_once_with(f"color: {calories_burned_red};")
+
+    def test_stats_reused_when_returning_to_timeframe(self, qtbot, mocker):
+        """Test that switching back to an unchanged timeframe restores its stats without recalculating them."""
+        # Entries 10 days apart so "1 Week" and "2 Weeks" cover different ranges
+        for days_ago, hours in ((10, 6), (0, 7)):
+            night = QDate.currentDate().addDays(-days_ago)
+            add_sleep_diary_entry(night, QDateTime(night, QTime(22, 0)), QDateTime(night.addDays(1), QTime(5, 0)), QTime(hours, 0))
+        widget = SleepDiary()
+        qtbot.addWidget(widget)
+        widget.show()
+        averages = mocker.spy(widgets.sleep_diary, "get_sleep_diary_averages")
+        week_stats = [(label.text(), label.styleSheet()) for label in widget.stats_labels]
+
+        widget.timeframe_selector.setCurrentIndex(1)
+        widget.load_table()
+        widget.timeframe_selector.setCurrentIndex(0)
+        widget.load_table()
+
+        assert averages.call_count == 1
+        assert [(label.text(), label.styleSheet()) for label in widget.stats_labels] == week_stats
+
     def test_load_table_empty(self, qtbot):
         """Test loading table with no entries."""
         widget = SleepDiary()
@@ -276,9 +963,10 @@ class TestSleepDiary:
         widget = SleepDiary()
         qtbot.addWidget(widget)
         
-        assert widget.table.columnCount() == 4
-        headers = [widget.table.horizontalHeaderItem(i).text() 
-                  for i in range(widget.table.columnCount())]
+        model = widget.table.model()
+        assert model.columnCount() == 4
+        headers = [model.headerData(i, Qt.Orientation.Horizontal) 
+                  for i in range(model.columnCount())]
         assert headers == ["Night", "Bedtime", "Wakeup", "Sleep Duration"]
     
     def test_table_not_editable(self, qtbot):
@@ -287,7 +975,12 @@ class TestSleepDiary:
         qtbot.addWidget(widget)
         
         # Table should not allow direct editing
-        assert widget.table.editTriggers() == widget.table.EditTrigger.NoEditTriggers
+        sleep_date = QDate.currentDate()
+        add_sleep_diary_entry(sleep_date, QDateTime(sleep_date, QTime(22, 0)), QDateTime(sleep_date.addDays(1), QTime(6, 0)), QTime(8, 0))
+        widget.load_table()
+        model = widget.table.model()
+        for column in range(model.columnCount()):
+            assert not model.flags(model.index(0, column)) & Qt.ItemFlag.ItemIsEditable
     
     def test_add_button_exists(self, qtbot):
         """Test that add entry button exists and is enabled."""
@@ -340,8 +1033,9 @@ class TestSleepDiary:
         add_sleep_diary_entry(weekday_date, weekday_bedtime, weekday_wakeup, weekday_duration)
 
         # Create one weekend night with 6h sleep (insufficient)
-        weekend_date = today
-        # Find most recent weekend (Sat/Sun) on or before today
+        # Find the most recent weekend (Sat/Sun) before the weekday night, so the weekday night is
+        # always the latest entry whatever day the test runs on
+        weekend_date = weekday_date.addDays(-1)
         while weekend_date.dayOfWeek() not in (6, 7):
             weekend_date = weekend_date.addDays(-1)
 
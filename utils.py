@@ -4,7 +4,8 @@ Contains AI request decorators and dialog helpers.
 """
 import threading
 import os
-from PyQt6.QtCore import QObject, pyqtSignal as Signal, QDate
+from functools import lru_cache
+from PyQt6.QtCore import QObject, QThreadPool, pyqtSignal as Signal, QDate, QTime
 from PyQt6.QtWidgets import QDialog, QComboBox
 from openai import OpenAI
 from dotenv import load_dotenv
@@ -54,6 +55,73 @@ class AIWorker(QObject):
             self.error.emit(f"Error: {str(e)}")
 
 
+class BackgroundWorker(QObject):
+    """
+    This class is a worker class to run blocking work (parsing, database writes, file copies) on a pool thread.
+    Like AIWorker, results are sent back to the GUI thread through signals so widgets are only touched there.
+    """
+    finished = Signal(object)  # Signal emitted with the function's return value
+    error = Signal(str)  # Signal emitted if there's an error
+
+    def __init__(self, func: Callable, *args, **kwargs):
+        """
+        Initialize the BackgroundWorker with the function to run.
+
+        Args:
+            func (Callable): The function to run in the background thread.
+            *args: Positional arguments passed to func.
+            **kwargs: Keyword arguments passed to func.
+        """
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+
+    def run(self):
+        """
+        Execute the function on a background pool thread.
+        Emits either a finished signal with the return value or an error signal if it raises.
+        """
+        try:
+            result = self.func(*self.args, **self.kwargs)
+        except Exception as e:
+            self.error.emit(f"Error: {str(e)}")
+        else:
+            self.finished.emit(result)
+
+
+def run_in_background(owner: QObject, func: Callable, *args, on_finished: Optional[Callable] = None, on_error: Optional[Callable] = None, **kwargs) -> BackgroundWorker:
+    """
+    Run a function on QThreadPool's global pool and deliver its result back to the GUI thread.
+    Handlers should be bound methods of QObjects living in the GUI thread (e.g. widget methods)
+    so that Qt queues the signal to that thread. Database access is safe here as use_db opens
+    a fresh connection per call.
+
+    Args:
+        owner (QObject): The object that keeps a reference to the worker.
+        func (Callable): The function to run in the background thread.
+        *args: Positional arguments passed to func.
+        on_finished (Callable, optional): Called with func's return value.
+        on_error (Callable, optional): Called with the error message if func raises.
+        **kwargs: Keyword arguments passed to func.
+
+    Returns:
+        BackgroundWorker: The worker running the function.
+    """
+    worker = BackgroundWorker(func, *args, **kwargs)
+    if on_finished is not None:
+        worker.finished.connect(on_finished)
+    if on_error is not None:
+        worker.error.connect(on_error)
+
+    # Store worker reference to prevent garbage collection
+    owner.current_background_worker = worker
+
+    # Run on Qt's shared thread pool so short jobs reuse threads rather than starting a new one each time
+    QThreadPool.globalInstance().start(worker.run)
+    return worker
+
+
 def run_ai_request(success_handler: str, error_handler: str):
     """
     Decorator factory to wrap a method that returns an AI prompt string.
@@ -172,7 +240,17 @@ class DaysOfTheWeek(Enum):
         return self.value
 
 
-def get_timeframe_dates(timeframe_selector: QComboBox, get_earliest_date_func: Optional[Callable] = None, timeframe_str: Optional[str] = None) -> Tuple[QDate, QDate]:
+# How far back each fixed-length timeframe starts, given the end date (today). "Full History" depends on the data so isn't listed.
+_TIMEFRAME_START_DATES = {
+    "1 Week": lambda end_qdate: end_qdate.addDays(-6),
+    "2 Weeks": lambda end_qdate: end_qdate.addDays(-13),
+    "1 Month": lambda end_qdate: end_qdate.addMonths(-1).addDays(1),
+    "3 Months": lambda end_qdate: end_qdate.addMonths(-3).addDays(1),
+    "1 Year": lambda end_qdate: end_qdate.addYears(-1).addDays(1),
+}
+
+
+def get_timeframe_dates(timeframe_selector: QComboBox, get_earliest_date_func: Optional[Callable] = None, timeframe_str: Optional[str] = None, end_qdate: Optional[QDate] = None) -> Tuple[QDate, QDate]:
     """
     Calculate start and end dates based on the selected timeframe in a QComboBox.
     
@@ -187,6 +265,8 @@ def get_timeframe_dates(timeframe_selector: QComboBox, get_earliest_date_func: O
                                 Used for "Full History" timeframe.
         timeframe_str: Optional string to override the combo box selection.
                        If provided, uses this instead of reading from the combo box.
+        end_qdate: Optional date the range ends on. Defaults to today; pass it when the
+                   caller has already read the current date so both agree across midnight.
     
     Returns:
         tuple: (start_qdate, end_qdate) as QDate objects
@@ -201,7 +281,8 @@ def get_timeframe_dates(timeframe_selector: QComboBox, get_earliest_date_func: O
     """
     if timeframe_str is None:
         timeframe_str = timeframe_selector.currentText()
-    end_qdate = QDate.currentDate()
+    if end_qdate is None:
+        end_qdate = QDate.currentDate()
     
     # Get earliest date if function provided
     earliest_qdate = None
@@ -215,17 +296,7 @@ def get_timeframe_dates(timeframe_selector: QComboBox, get_earliest_date_func: O
                 earliest_qdate = QDate.fromString(earliest_result, "yyyy-MM-dd")
     
     # Calculate start date based on timeframe
-    if timeframe_str == "1 Week":
-        start_qdate = end_qdate.addDays(-6)
-    elif timeframe_str == "2 Weeks":
-        start_qdate = end_qdate.addDays(-13)
-    elif timeframe_str == "1 Month":
-        start_qdate = end_qdate.addMonths(-1).addDays(1)
-    elif timeframe_str == "3 Months":
-        start_qdate = end_qdate.addMonths(-3).addDays(1)
-    elif timeframe_str == "1 Year":
-        start_qdate = end_qdate.addYears(-1).addDays(1)
-    elif timeframe_str == "Full History":
+    if timeframe_str == "Full History":
         if earliest_qdate is None:
             # No entries in database, return empty range
             start_qdate = end_qdate
@@ -233,10 +304,28 @@ def get_timeframe_dates(timeframe_selector: QComboBox, get_earliest_date_func: O
             start_qdate = earliest_qdate
     else:
         # Default to 1 week if unknown timeframe
-        start_qdate = end_qdate.addDays(-6)
+        start_qdate = _TIMEFRAME_START_DATES.get(timeframe_str, _TIMEFRAME_START_DATES["1 Week"])(end_qdate)
     
     # Ensure start date doesn't go before earliest available date
     if earliest_qdate and start_qdate < earliest_qdate:
         start_qdate = earliest_qdate
     
-    return start_qdate, end_qdate
\ No newline at end of file
+    return start_qdate, end_qdate
+
+
+@lru_cache(maxsize=2048)
+def time_to_seconds(time_str: str) -> Optional[int]:
+    """
+    Convert an "HH:mm" time string from the database into seconds since midnight.
+    Results are cached as the same times repeat across rows and reloads.
+
+    Args:
+        time_str (str): The time in "HH:mm" format.
+
+    Returns:
+        int or None: The number of seconds, or None if the string isn't a valid time.
+    """
+    qtime = QTime.fromString(time_str, "HH:mm")
+    if not qtime.isValid():
+        return None
+    return qtime.hour() * 3600 + qtime.minute() * 60
@@ -1,7 +1,7 @@
 """
 DayWidget widget for the Health App.
 """
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QSignalBlocker
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QTextEdit, QMessageBox
 from utils import run_ai_request, planner_options_dialog, DaysOfTheWeek
 from database import get_pantry_items, get_meal_plan_for_day, update_meal_plan_for_day
@@ -12,9 +12,14 @@ class DayWidget(QWidget):
     It contains a header label(button) for the day name and a QTextEdit for the meal list.
     The meal list is automatically saved to the database when changed.
     """
-    def __init__(self, day_name: DaysOfTheWeek):
+    def __init__(self, day_name: DaysOfTheWeek, day_text: str = None):
         """
         Initialize the DayWidget with the day name and valid days.
+
+        Args:
+            day_name (DaysOfTheWeek): The day this widget represents.
+            day_text (str, optional): Meal plan text already fetched by the caller.
+                If not given, it is loaded from the database.
         """
         super().__init__()
         self.day_name = day_name
@@ -29,12 +34,9 @@ class DayWidget(QWidget):
         
         # Meal list text editor
         self.meal_list = QTextEdit()
-        day_text = self.get_day_text_from_db()
-        if day_text is None or day_text == "":
-            self.meal_list.setText("• Breakfast\n• Lunch\n• Dinner\n• Snacks")
-        else:
-            self.meal_list.setText(day_text)
-        self.meal_list.setAlignment(Qt.AlignmentFlag.AlignTop)  # Align text to top for better wrapping
+        if day_text is None:
+            day_text = self.get_day_text_from_db()
+        self.set_day_text(day_text)
         
         # Connect textChanged signal to save to database
         self.meal_list.textChanged.connect(self.on_text_changed)
@@ -54,6 +56,21 @@ class DayWidget(QWidget):
         """
         return get_meal_plan_for_day(self.day_name)
     
+    def set_day_text(self, day_text: str):
+        """
+        Show the given meal plan text, falling back to the default meal headings if empty.
+        Signals are blocked so that displaying the text doesn't write it back to the database.
+
+        Args:
+            day_text (str): The meal plan text for this day.
+        """
+        with QSignalBlocker(self.meal_list):
+            if day_text is None or day_text == "":
+                self.meal_list.setText("• Breakfast\n• Lunch\n• Dinner\n• Snacks")
+            else:
+                self.meal_list.setText(day_text)
+            self.meal_list.setAlignment(Qt.AlignmentFlag.AlignTop)  # Align text to top for better wrapping
+
     def on_text_changed(self):
         """
         Handle text changes in the meal list editor.
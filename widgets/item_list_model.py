@@ -0,0 +1,91 @@
+"""
+ItemListModel for the Health App.
+"""
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class ItemListModel(QAbstractListModel):
+    """
+    List model backing the pantry and shopping list views.
+    Each row is an (id, display_text) tuple: the text is shown in the view and the id
+    is kept alongside it for deletion. Replacing the rows is a single model reset rather
+    than creating a widget item per row.
+    """
+    def __init__(self, parent=None):
+        """
+        Initialize the ItemListModel with no rows.
+
+        Args:
+            parent (QObject, optional): The parent object for this model.
+        """
+        super().__init__(parent)
+        self._rows = []
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Return the number of rows in the model.
+
+        Args:
+            parent (QModelIndex): Unused for a flat list; must be invalid.
+
+        Returns:
+            int: The number of rows.
+        """
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """
+        Return the display text or id for a row.
+
+        Args:
+            index (QModelIndex): The row to read.
+            role (Qt.ItemDataRole): DisplayRole for the text, UserRole for the id.
+
+        Returns:
+            str, int or None: The requested value, or None for other roles.
+        """
+        if not index.isValid():
+            return None
+        item_id, text = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return text
+        if role == Qt.ItemDataRole.UserRole:
+            return item_id
+        return None
+
+    def set_rows(self, rows: list):
+        """
+        Replace all rows in the model with a single reset.
+
+        Args:
+            rows (list): A list of (id, display_text) tuples.
+        """
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def append_row(self, row: tuple):
+        """
+        Add a single row to the end of the model without resetting it.
+
+        Args:
+            row (tuple): An (id, display_text) tuple.
+        """
+        position = len(self._rows)
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.append(row)
+        self.endInsertRows()
+
+    def item_id(self, row: int) -> int:
+        """
+        Get the id stored for a row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            int: The id of the item in that row.
+        """
+        return self._rows[row][0]
@@ -3,7 +3,7 @@ MealPlan widget for the Health App.
 """
 from PyQt6.QtCore import QSettings
 from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout
-from database import create_meal_plan_row
+from database import create_meal_plan_row, get_meal_plans_for_days
 from widgets.day_widget import DayWidget
 from utils import DaysOfTheWeek
 
@@ -36,10 +36,13 @@ class MealPlan(QWidget):
         self.days_layout.setSpacing(2)  # Minimal spacing between columns
         self.days_layout.setContentsMargins(5, 5, 5, 5)
         
+        # Fetch every day's meal plan with one query rather than letting each DayWidget query its own
+        day_texts = get_meal_plans_for_days([day.value for day in DaysOfTheWeek])
+
         # Create a widget for each day
         self.day_widgets = []
         for day in self.days:
-            day_widget = DayWidget(day)
+            day_widget = DayWidget(day, day_texts.get(DaysOfTheWeek[day].value))
             self.day_widgets.append(day_widget)
             # Add stretch to make each day widget expand equally
             self.days_layout.addWidget(day_widget, 1)  # Stretch factor of 1 for equal distribution
@@ -60,4 +63,3 @@ class MealPlan(QWidget):
         meal_plan_ai_enabled = self.settings.value("meal_plan_ai_enabled", False, type=bool)
         for day_widget in self.day_widgets:
             day_widget.day_header.setEnabled(meal_plan_ai_enabled)
-
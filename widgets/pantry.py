@@ -1,14 +1,44 @@
 """
 Pantry widget for the Health App.
 """
-from PyQt6.QtCore import Qt, QEvent
+import re
+from types import MappingProxyType
+from PyQt6.QtCore import Qt, QEvent, QTimer, QLocale
+from PyQt6.QtGui import QIntValidator
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton,
-    QListWidget, QListWidgetItem, QDialog, QDialogButtonBox, QFormLayout,
+    QListView, QDialog, QDialogButtonBox, QFormLayout,
     QMessageBox, QSplitter
 )
-from database import add_pantry_item, add_shopping_list_item, get_pantry_items, get_shopping_list_items, clear_pantry, clear_shopping_list, delete_pantry_items, delete_shopping_list_items, get_meal_plan_for_day
-from utils import run_ai_request, planner_options_dialog
+from database import add_pantry_item, add_shopping_list_item, add_shopping_list_items, get_pantry_items, get_shopping_list_items, clear_pantry, clear_shopping_list, delete_pantry_items, delete_shopping_list_items, get_meal_plans_for_days, get_pantry_version, get_shopping_list_version
+from widgets.item_list_model import ItemListModel
+from utils import run_ai_request, planner_options_dialog, run_in_background, DaysOfTheWeek
+
+# Maps the day chip keys of the shopping list options dialog to meal_plan column names.
+# Built once at import and read-only so it can't drift from DaysOfTheWeek.
+_DAY_KEY_TO_COLUMN = MappingProxyType({day.name.lower(): day.value for day in DaysOfTheWeek})
+
+# Lines of an AI shopping list response that are formatting rather than items
+_SHOPPING_SKIP_EXACT = frozenset({"**Shopping List:**", "### Shopping List", "Shopping List", "-", "*", "•"})
+_SHOPPING_SKIP_PREFIXES = ("#", "---", "===")
+_SHOPPING_NOTE_RE = re.compile(r"(?:feel free|note:)", re.IGNORECASE)
+_SHOPPING_BULLET_RE = re.compile(r"^[-*•] ")
+
+
+def _is_valid_shopping_item(item: str) -> bool:
+    """
+    Check if an item is a valid shopping list item (not formatting/header).
+    Skips empty lines, markdown headers and separators, bare list markers,
+    notes/instructions, and anything too short to be a real item.
+    """
+    item = item.strip()
+    return (
+        len(item) >= 3
+        and item not in _SHOPPING_SKIP_EXACT
+        and not item.startswith(_SHOPPING_SKIP_PREFIXES)
+        and not _SHOPPING_NOTE_RE.match(item)
+    )
+
 
 class Pantry(QWidget):
     """
@@ -20,34 +50,28 @@ class Pantry(QWidget):
         """
         Initialize the Pantry widget.
         Sets up the pantry and shopping list sections with their respective
-        buttons and list widgets. Installs event filters for keyboard handling
+        buttons and list views. Installs event filters for keyboard handling
         and loads existing data from the database.
         """
         super().__init__()
         self.layout = QVBoxLayout()
 
-        # Section for the pantry
-        self.pantry_layout = QVBoxLayout()
-        # Header for labels and buttons
-        self.pantry_header_layout = QHBoxLayout()
+        # Section for the pantry: header of label and buttons above the list of items in the pantry
         self.pantry_label = QLabel("Pantry")
         self.add_item_pantry_button = QPushButton("Add Item to Pantry")
         self.add_item_pantry_button.clicked.connect(self.add_entry_pantry)
         self.clear_pantry_button = QPushButton("Clear Pantry")
         self.clear_pantry_button.clicked.connect(self.clear_pantry)
-        self.pantry_header_layout.addWidget(self.pantry_label)
-        self.pantry_header_layout.addWidget(self.add_item_pantry_button)
-        self.pantry_header_layout.addWidget(self.clear_pantry_button)
-        # List of items in the pantry
-        self.pantry_items = QListWidget()
-        # Add the header and list to the pantry layout
-        self.pantry_layout.addLayout(self.pantry_header_layout)
-        self.pantry_layout.addWidget(self.pantry_items)
-
-        # Section for the shopping list
-        self.shopping_list_layout = QVBoxLayout()
-        # Header for labels and buttons
-        self.shopping_header_layout = QHBoxLayout()
+        self.pantry_items = QListView()
+        self.pantry_model = ItemListModel(self)
+        self.pantry_items.setModel(self.pantry_model)
+        self.pantry_layout, self.pantry_header_layout = self._build_section(
+            self.pantry_label,
+            [self.add_item_pantry_button, self.clear_pantry_button],
+            self.pantry_items,
+        )
+
+        # Section for the shopping list: header of label and buttons above the list of items in the shopping list
         self.shopping_list_label = QLabel("Shopping List")
         self.add_item_shopping_button = QPushButton("Add Item to Shopping List")
         self.add_item_shopping_button.clicked.connect(self.add_entry_shopping)
@@ -55,15 +79,20 @@ class Pantry(QWidget):
         self.generate_shopping_list_button.clicked.connect(self.generate_shopping_list)
         self.clear_shopping_list_button = QPushButton("Clear Shopping List")
         self.clear_shopping_list_button.clicked.connect(self.clear_shopping_list)
-        self.shopping_header_layout.addWidget(self.shopping_list_label)
-        self.shopping_header_layout.addWidget(self.add_item_shopping_button)
-        self.shopping_header_layout.addWidget(self.generate_shopping_list_button)
-        self.shopping_header_layout.addWidget(self.clear_shopping_list_button)
-        # List of items in the shopping list
-        self.shopping_list_items = QListWidget()
-        # Add the header and list to the shopping list layout
-        self.shopping_list_layout.addLayout(self.shopping_header_layout)
-        self.shopping_list_layout.addWidget(self.shopping_list_items)
+        self.shopping_list_items = QListView()
+        self.shopping_list_model = ItemListModel(self)
+        self.shopping_list_items.setModel(self.shopping_list_model)
+        self.shopping_list_layout, self.shopping_header_layout = self._build_section(
+            self.shopping_list_label,
+            [self.add_item_shopping_button, self.generate_shopping_list_button, self.clear_shopping_list_button],
+            self.shopping_list_items,
+        )
+
+        # Every row is a single line of text, so let the lists skip per-item size hints and lay out in batches
+        for list_view in (self.pantry_items, self.shopping_list_items):
+            list_view.setUniformItemSizes(True)
+            list_view.setLayoutMode(QListView.LayoutMode.Batched)
+            list_view.setBatchSize(100)
 
         # Add the pantry and shopping list layouts to the main layout. They need to be in separate containers to be able to split them vertically with the splitter.
         pantry_container = QWidget()
@@ -71,7 +100,7 @@ class Pantry(QWidget):
         shopping_container = QWidget()
         shopping_container.setLayout(self.shopping_list_layout)
 
-        # Install event filters so DEL works when focus is on either list widget
+        # Install event filters so DEL works when focus is on either list view
         self.pantry_items.installEventFilter(self)
         self.shopping_list_items.installEventFilter(self)
 
@@ -82,36 +111,122 @@ class Pantry(QWidget):
         self.layout.addWidget(self.pantry_splitter)
         self.setLayout(self.layout)
 
+        # Single-shot timers used to coalesce bursts of reload requests (e.g. several edits in a row) into one reload
+        self.pantry_reload_timer = self._build_reload_timer(self.load_pantry)
+        self.shopping_list_reload_timer = self._build_reload_timer(self.load_shopping_list)
+
+        # Table versions the lists were last loaded at, so reloads can be skipped when nothing changed
+        self._pantry_version = -1
+        self._shopping_list_version = -1
+
+        # Add item dialogs are built lazily on first use and then reused
+        self._add_pantry_dialog = None
+        self._add_shopping_dialog = None
+
         # Load the pantry and shopping list to ensure up to date
         self.load_pantry()
         self.load_shopping_list()
 
+    @staticmethod
+    def _build_section(label: QLabel, buttons: list, list_view: QListView):
+        """
+        Lay out one section of the page: a header row with the label and buttons above the list view.
+
+        Args:
+            label (QLabel): The section title.
+            buttons (list): The header buttons, in display order.
+            list_view (QListView): The list of items for the section.
+
+        Returns:
+            tuple: (section_layout, header_layout)
+        """
+        header_layout = QHBoxLayout()
+        header_layout.addWidget(label)
+        for button in buttons:
+            header_layout.addWidget(button)
+        section_layout = QVBoxLayout()
+        section_layout.addLayout(header_layout)
+        section_layout.addWidget(list_view)
+        return section_layout, header_layout
+
+    def _build_reload_timer(self, slot):
+        """
+        Create the single-shot debounce timer that calls a load method.
+
+        Args:
+            slot (Callable): The load method to call when the timer fires.
+
+        Returns:
+            QTimer: The configured timer.
+        """
+        timer = QTimer(self)
+        timer.setSingleShot(True)
+        timer.setInterval(50)
+        timer.timeout.connect(slot)
+        return timer
+
     def add_entry_pantry(self):
         """
         Show dialog to create a new pantry item entry.
         Allows the user to enter an item name and weight in grams,
         then saves it to the database and refreshes the pantry list.
+        The dialog is built on first use and reused afterwards.
+        """
+        if self._add_pantry_dialog is None:
+            self._add_pantry_dialog = self._build_add_pantry_dialog()
+        dialog, item_input, weight_input = self._add_pantry_dialog
+        item_input.clear()
+        weight_input.clear()
+        item_input.setFocus()
+
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return
+
+        # The Add button is only enabled for valid input, so this only guards against text set programmatically
+        item = item_input.text().strip()
+        if not item or not weight_input.hasAcceptableInput():
+            return
+        weight = int(weight_input.text())
+
+        # Only one row changed, so append it to the list rather than reloading the whole pantry
+        item_id = add_pantry_item(item, weight)
+        self.pantry_model.append_row((item_id, f"{item} ({weight} g)"))
+
+    def _build_add_pantry_dialog(self):
+        """
+        Build the dialog used by add_entry_pantry.
+
+        Returns:
+            tuple: (dialog, item_input, weight_input)
         """
         dialog = QDialog(self)
         dialog.setWindowTitle("Add item to pantry")
         dialog.setModal(True)
 
-        self.layout = QVBoxLayout()
-        self.layout.setContentsMargins(20, 20, 20, 20)
-        self.layout.setSpacing(12)
+        # Parent the layout to the dialog directly so no setLayout call is needed
+        layout = QVBoxLayout(dialog)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(12)
 
         message_label = QLabel("What item would you like to add to your pantry?")
         message_label.setWordWrap(True)
-        self.layout.addWidget(message_label)
+        layout.addWidget(message_label)
 
         input_layout = QFormLayout()
         item_input = QLineEdit(dialog)
         item_input.setPlaceholderText("Enter item name")
         weight_input = QLineEdit(dialog)
         weight_input.setPlaceholderText("Enter weight in grams")
+        # Validate the weight natively as it is typed. The C locale without group separators
+        # means any acceptable text is plain digits that int() can parse.
+        weight_validator = QIntValidator(0, 10_000_000, dialog)
+        validator_locale = QLocale.c()
+        validator_locale.setNumberOptions(QLocale.NumberOption.RejectGroupSeparator)
+        weight_validator.setLocale(validator_locale)
+        weight_input.setValidator(weight_validator)
         input_layout.addRow("Item:", item_input)
         input_layout.addRow("Weight:", weight_input)
-        self.layout.addLayout(input_layout)
+        layout.addLayout(input_layout)
 
         button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
         add_button = button_box.button(QDialogButtonBox.StandardButton.Ok)
@@ -120,8 +235,29 @@ class Pantry(QWidget):
         cancel_button.setText("Cancel")
         button_box.accepted.connect(dialog.accept)
         button_box.rejected.connect(dialog.reject)
-        self.layout.addWidget(button_box)
-        dialog.setLayout(self.layout)
+        layout.addWidget(button_box)
+
+        # Only allow adding once there is an item name and a valid weight
+        def update_add_button():
+            add_button.setEnabled(weight_input.hasAcceptableInput() and bool(item_input.text().strip()))
+        item_input.textChanged.connect(update_add_button)
+        weight_input.textChanged.connect(update_add_button)
+        update_add_button()
+
+        return dialog, item_input, weight_input
+
+    def add_entry_shopping(self):
+        """
+        Show dialog to create a new shopping list item entry.
+        Allows the user to enter an item name, then saves it to the database
+        and refreshes the shopping list.
+        The dialog is built on first use and reused afterwards.
+        """
+        if self._add_shopping_dialog is None:
+            self._add_shopping_dialog = self._build_add_shopping_dialog()
+        dialog, item_input = self._add_shopping_dialog
+        item_input.clear()
+        item_input.setFocus()
 
         if dialog.exec() != QDialog.DialogCode.Accepted:
             return
@@ -129,27 +265,22 @@ class Pantry(QWidget):
         item = item_input.text().strip()
         if not item:
             return
+        # Only one row changed, so append it to the list rather than reloading the whole shopping list
+        item_id = add_shopping_list_item(item)
+        self.shopping_list_model.append_row((item_id, item))
 
-        try:
-            weight = int(weight_input.text())
-        except ValueError:
-            QMessageBox.warning(self, "Add Entry", "Weight must be a whole number.")
-            return
-
-        add_pantry_item(item, weight)
-        self.load_pantry()
-
-    def add_entry_shopping(self):
+    def _build_add_shopping_dialog(self):
         """
-        Show dialog to create a new shopping list item entry.
-        Allows the user to enter an item name, then saves it to the database
-        and refreshes the shopping list.
+        Build the dialog used by add_entry_shopping.
+
+        Returns:
+            tuple: (dialog, item_input)
         """
         dialog = QDialog(self)
         dialog.setWindowTitle("Add item to shopping list")
         dialog.setModal(True)
 
-        layout = QVBoxLayout()
+        layout = QVBoxLayout(dialog)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(12)
 
@@ -171,42 +302,52 @@ class Pantry(QWidget):
         button_box.accepted.connect(dialog.accept)
         button_box.rejected.connect(dialog.reject)
         layout.addWidget(button_box)
-        dialog.setLayout(layout)
-
-        if dialog.exec() != QDialog.DialogCode.Accepted:
-            return
 
-        item = item_input.text().strip()
-        if not item:
-            return
-        add_shopping_list_item(item)
-        self.load_shopping_list()
+        return dialog, item_input
 
     def load_pantry(self):
         """
         Load the pantry items from the database.
         Fetches all pantry items with their IDs and weights, and displays
-        them in the pantry list widget in the format "item_name (weight g)".
+        them in the pantry list in the format "item_name (weight g)".
+        Does nothing if the pantry table hasn't changed since the last load.
         """
-        pantry_items = get_pantry_items()
-        self.pantry_items.clear()
-        for item_id, item_name, weight in pantry_items:
-            list_item = QListWidgetItem(f"{item_name} ({weight} g)")
-            list_item.setData(Qt.ItemDataRole.UserRole, item_id)  # Store ID for deletion
-            self.pantry_items.addItem(list_item)
+        version = get_pantry_version()
+        if version == self._pantry_version:
+            return
+        self._pantry_version = version
+        self.pantry_model.set_rows(
+            [(item_id, f"{item_name} ({weight} g)") for item_id, item_name, weight in get_pantry_items()]
+        )
 
     def load_shopping_list(self):
         """
         Load the shopping list from the database.
         Fetches all shopping list items with their IDs and displays
-        them in the shopping list widget.
+        them in the shopping list.
+        Does nothing if the shopping_list table hasn't changed since the last load.
+        """
+        version = get_shopping_list_version()
+        if version == self._shopping_list_version:
+            return
+        self._shopping_list_version = version
+        self.shopping_list_model.set_rows(get_shopping_list_items())
+
+    def schedule_load_pantry(self):
+        """
+        Request a reload of the pantry list.
+        Restarts the debounce timer so that several requests within a short
+        window result in a single call to load_pantry.
         """
-        shopping_list_items = get_shopping_list_items()
-        self.shopping_list_items.clear()
-        for item_id, item_name in shopping_list_items:
-            list_item = QListWidgetItem(item_name)
-            list_item.setData(Qt.ItemDataRole.UserRole, item_id)  # Store ID for deletion
-            self.shopping_list_items.addItem(list_item)
+        self.pantry_reload_timer.start()
+
+    def schedule_load_shopping_list(self):
+        """
+        Request a reload of the shopping list.
+        Restarts the debounce timer so that several requests within a short
+        window result in a single call to load_shopping_list.
+        """
+        self.shopping_list_reload_timer.start()
 
     def clear_pantry(self):
         """
@@ -214,7 +355,7 @@ class Pantry(QWidget):
         Deletes all rows from the pantry table and refreshes the display.
         """
         clear_pantry()
-        self.load_pantry()
+        self.schedule_load_pantry()
 
     def clear_shopping_list(self):
         """
@@ -222,7 +363,7 @@ class Pantry(QWidget):
         Deletes all rows from the shopping_list table and refreshes the display.
         """
         clear_shopping_list()
-        self.load_shopping_list()
+        self.schedule_load_shopping_list()
 
     def keyPressEvent(self, event):
         """
@@ -234,7 +375,7 @@ class Pantry(QWidget):
 
     def eventFilter(self, obj, event):
         """
-        Catch DEL key presses when focus is on one of the list widgets and
+        Catch DEL key presses when focus is on one of the list views and
         route them to the appropriate delete handler.
         
         Args:
@@ -259,14 +400,14 @@ class Pantry(QWidget):
         Shows a confirmation dialog before deleting. Deletes all selected items
         and refreshes the pantry list.
         """
-        selected_items = self.pantry_items.selectedItems()
-        if not selected_items:
+        selected_rows = sorted({index.row() for index in self.pantry_items.selectedIndexes()})
+        if not selected_rows:
             return
 
         reply = QMessageBox.question(
             self,
             "Delete Confirmation",
-            f"Delete {len(selected_items)} item(s) from pantry?",
+            f"Delete {len(selected_rows)} item(s) from pantry?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
 
@@ -274,8 +415,8 @@ class Pantry(QWidget):
             return
 
         # Delete the selected items from database and reload the pantry
-        delete_pantry_items(selected_items)
-        self.load_pantry()
+        delete_pantry_items([self.pantry_model.item_id(row) for row in selected_rows])
+        self.schedule_load_pantry()
 
     def delete_selected_item_shopping(self):
         """
@@ -283,22 +424,22 @@ class Pantry(QWidget):
         Shows a confirmation dialog before deleting. Deletes all selected items
         and refreshes the shopping list.
         """
-        selected_items = self.shopping_list_items.selectedItems()
-        if not selected_items:
+        selected_rows = sorted({index.row() for index in self.shopping_list_items.selectedIndexes()})
+        if not selected_rows:
             return
 
         reply = QMessageBox.question(
             self,
             "Delete Confirmation",
-            f"Delete {len(selected_items)} item(s) from shopping list?",
+            f"Delete {len(selected_rows)} item(s) from shopping list?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
         )
 
         if reply == QMessageBox.StandardButton.No:
             return
 
-        delete_shopping_list_items(selected_items)
-        self.load_shopping_list()
+        delete_shopping_list_items([self.shopping_list_model.item_id(row) for row in selected_rows])
+        self.schedule_load_shopping_list()
 
     @planner_options_dialog(
         title="Shopping List Options",
@@ -333,83 +474,97 @@ class Pantry(QWidget):
             str: The AI prompt string for generating the shopping list.
         """
         # get the meal plan from the meal plan page for the selected days to use for the shopping list  
-        meal_plans = ""
-        day_key_to_column = {
-            "monday": "Monday",
-            "tuesday": "Tuesday",
-            "wednesday": "Wednesday",
-            "thursday": "Thursday",
-            "friday": "Friday",
-            "saturday": "Saturday",
-            "sunday": "Sunday",
-        }
-
-        for key, selected in options.items():
-            if not selected or key == "ignore_pantry":
-                continue
-            column = day_key_to_column.get(key)
-            if not column:
-                continue
-            meal_plan_for_day = get_meal_plan_for_day(column)
-            if meal_plan_for_day:
-                meal_plans += meal_plan_for_day + "\n"
+        selected_columns = [
+            _DAY_KEY_TO_COLUMN[key]
+            for key, selected in options.items()
+            if selected and key in _DAY_KEY_TO_COLUMN
+        ]
+        # All days live in one row, so fetch every selected day with a single query
+        meal_plan_by_day = get_meal_plans_for_days(selected_columns)
+        meal_plans = "\n".join(
+            meal_plan_by_day[column] for column in selected_columns if meal_plan_by_day.get(column)
+        )
         
-        ai_prompt = "Generate a shopping list of ingridients based on these meal plans: " + meal_plans + "For your response please only provide an itemised list of ingridients and nothing else as this will be parsed into a list and added to the shopping list."
+        ai_prompt = (
+            f"Generate a shopping list of ingridients based on these meal plans: {meal_plans}\n"
+            "For your response please only provide an itemised list of ingridients and nothing else as this will be parsed into a list and added to the shopping list."
+        )
         
         return ai_prompt
 
     def shopping_list_on_ai_response(self, response):
         """
         Handle successful AI response for shopping list generation.
-        Parses the response into individual items, adds them to the shopping list
-        widget, and saves them to the database (skipping empty lines, headers, and formatting).
+        Parsing the response and saving the items to the database runs in a background
+        thread so the GUI stays responsive. The shopping list is reloaded once it's done.
         
         Args:
             response (str): The AI-generated shopping list text.
-        """        
-
-        def is_valid_shopping_item(item: str) -> bool: 
-            """AI written funtion that check if an item is a valid shopping list item (not formatting/header)."""
-            item = item.strip()
-            # Skip empty lines
-            if not item:
-                return False
-            # Skip markdown headers (lines starting with #)
-            if item.startswith("#"):
-                return False
-            # Skip common formatting patterns
-            if item in ["**Shopping List:**", "### Shopping List", "Shopping List"]:
-                return False
-            # Skip lines that are just separators or formatting
-            if item.startswith("---") or item.startswith("==="):
-                return False
-            # Skip lines that are just markdown list markers without content
-            if item in ["-", "*", "•"]:
-                return False
-            # Skip lines that are just instructions or notes
-            if item.lower().startswith("feel free") or item.lower().startswith("note:"):
-                return False
-            # Skip lines that are section headers (all caps or title case with no actual item)
-            if len(item) < 3:  # Too short to be a real item
-                return False
-            return True
+        """
+        run_in_background(
+            self,
+            self._save_shopping_list_response,
+            response,
+            on_finished=self.shopping_list_on_items_saved,
+            on_error=self.shopping_list_on_ai_error,
+        )
+
+    def shopping_list_on_items_saved(self, items):
+        """
+        Handle the background save of the AI shopping list finishing.
         
-        for item in response.split("\n"):
-            item_cleaned = item.strip()
-            # Remove markdown list markers (-, *, •) and bullet points from the start
-            if item_cleaned.startswith("- "):
-                item_cleaned = item_cleaned[2:].strip()
-            elif item_cleaned.startswith("* "):
-                item_cleaned = item_cleaned[2:].strip()
-            elif item_cleaned.startswith("• "):
-                item_cleaned = item_cleaned[2:].strip()
-            
-            # Only add valid items
-            if is_valid_shopping_item(item_cleaned):
-                self.shopping_list_items.addItem(item_cleaned)
-                add_shopping_list_item(item_cleaned)
+        Args:
+            items (list): The items that were added to the shopping list.
+        """
+        if items:
+            self.schedule_load_shopping_list()
 
-        self.load_shopping_list()
+    @staticmethod
+    def _parse_shopping_list_response(response: str) -> list:
+        """
+        Parse an AI shopping list response into individual items,
+        skipping empty lines, headers, and formatting.
+        Items repeated across days (ignoring case) are only kept once, in the position they first appear.
+        
+        Args:
+            response (str): The AI-generated shopping list text.
+        
+        Returns:
+            list: The cleaned shopping list items.
+        """
+        # Keyed by the lower-cased item so "Eggs" and "eggs" count as the same item; dicts keep insertion order
+        items = {}
+        # splitlines handles \r\n responses too, so no stray \r is left on items to defeat the exact-match checks
+        for line in response.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            # Remove a markdown list marker (-, *, •) from the start
+            item_cleaned = _SHOPPING_BULLET_RE.sub("", line, count=1).strip()
+            # Only keep valid items
+            if _is_valid_shopping_item(item_cleaned):
+                items.setdefault(item_cleaned.lower(), item_cleaned)
+        return list(items.values())
+
+    @staticmethod
+    def _save_shopping_list_response(response: str) -> list:
+        """
+        Parse an AI shopping list response and save the items to the database.
+        Runs in a background thread, so it must not touch any widgets.
+        
+        Args:
+            response (str): The AI-generated shopping list text.
+        
+        Returns:
+            list: The items that were added to the shopping list.
+        """
+        items = Pantry._parse_shopping_list_response(response)
+        # Nothing usable in the response, so don't touch the database
+        if not items:
+            return items
+
+        add_shopping_list_items(items)
+        return items
 
     def shopping_list_on_ai_error(self, error_message):
         """
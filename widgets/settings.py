@@ -5,11 +5,12 @@ import sys
 import os
 import shutil
 from datetime import datetime
-from PyQt6.QtCore import QSettings, Qt
+from PyQt6.QtCore import QSettings, QSignalBlocker, Qt, QTimer
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QCheckBox, QPushButton, QFileDialog, QMessageBox
+    QWidget, QVBoxLayout, QCheckBox, QPushButton, QFileDialog, QMessageBox, QProgressDialog
 )
 from database import get_db_path
+from utils import run_in_background
 
 class Settings(QWidget):
     """
@@ -29,6 +30,18 @@ class Settings(QWidget):
         
         # Initialize QSettings for persistent settings
         self.settings = QSettings("MindfulMauschen", "HealthApp")
+        # Read every setting from persistent storage once and keep them in memory.
+        # Values only change through this widget, so saves update this cache alongside QSettings.
+        self.cached_settings = {
+            key: self.settings.value(key, False, type=bool)
+            for key in (
+                "startup_enabled",
+                "food_ai_enabled",
+                "exercise_ai_enabled",
+                "silent_notif_enabled",
+                "meal_plan_ai_enabled",
+            )
+        }
 
         
         # Toggle checkboxes section
@@ -48,11 +61,17 @@ class Settings(QWidget):
         self.export_database_button = QPushButton("Export Database")
         self.export_database_button.clicked.connect(self.export_database)
 
-        # Connect checkbox state changes to save settings (except startup which is handled separately)
-        self.food_ai_checkbox.stateChanged.connect(self.save_settings)
-        self.exercise_ai_checkbox.stateChanged.connect(self.save_settings)
-        self.meal_plan_ai_checkbox.stateChanged.connect(self.save_settings)
-        self.silent_notif_checkbox.stateChanged.connect(self.save_settings)
+        # Flushing QSettings to disk/registry is deferred so a burst of toggles results in one sync
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setSingleShot(True)
+        self.sync_timer.setInterval(200)
+        self.sync_timer.timeout.connect(self.settings.sync)
+
+        # Connect checkbox state changes to save only the setting that changed (except startup which is handled separately)
+        self.food_ai_checkbox.toggled.connect(lambda checked: self.save_setting("food_ai_enabled", checked))
+        self.exercise_ai_checkbox.toggled.connect(lambda checked: self.save_setting("exercise_ai_enabled", checked))
+        self.meal_plan_ai_checkbox.toggled.connect(lambda checked: self.save_setting("meal_plan_ai_enabled", checked))
+        self.silent_notif_checkbox.toggled.connect(lambda checked: self.save_setting("silent_notif_enabled", checked))
         
         # Add widgets to layout
         self.layout.addWidget(self.startup_checkbox)
@@ -118,61 +137,58 @@ class Settings(QWidget):
     def load_settings(self):
         """
         Load saved settings and apply them to checkboxes.
-        Temporarily blocks signals during loading to prevent save_settings
+        Temporarily blocks signals during loading to prevent save_setting
         from being called multiple times, ensuring all checkbox states are set correctly.
         """
         # Originally was having issues where toggling multiple checkboxes at once would only save one of  them
-        # As such added in block signals while loading to prevent save_settings from being called and ensuring all checkbox states are saved correctly
-        self.startup_checkbox.blockSignals(True)
-        self.food_ai_checkbox.blockSignals(True)
-        self.exercise_ai_checkbox.blockSignals(True)
-        self.silent_notif_checkbox.blockSignals(True)
-        self.meal_plan_ai_checkbox.blockSignals(True)
-        
-        # Load checkbox states (default to False if not found)
-        self.startup_checkbox.setChecked(
-            self.settings.value("startup_enabled", False, type=bool)
-        )
-        self.food_ai_checkbox.setChecked(
-            self.settings.value("food_ai_enabled", False, type=bool)
-        )
-        self.exercise_ai_checkbox.setChecked(
-            self.settings.value("exercise_ai_enabled", False, type=bool)
-        )
-        self.silent_notif_checkbox.setChecked(
-            self.settings.value("silent_notif_enabled", False, type=bool)
+        # As such signals are blocked while loading to prevent save_setting from being called and ensuring all checkbox states are saved correctly.
+        checkboxes = (
+            (self.startup_checkbox, "startup_enabled"),
+            (self.food_ai_checkbox, "food_ai_enabled"),
+            (self.exercise_ai_checkbox, "exercise_ai_enabled"),
+            (self.silent_notif_checkbox, "silent_notif_enabled"),
+            (self.meal_plan_ai_checkbox, "meal_plan_ai_enabled"),
         )
-        self.meal_plan_ai_checkbox.setChecked(
-            self.settings.value("meal_plan_ai_enabled", False, type=bool)
-        )
-        
-        # Unblock signals after loading
-        self.startup_checkbox.blockSignals(False)
-        self.food_ai_checkbox.blockSignals(False)
-        self.exercise_ai_checkbox.blockSignals(False)
-        self.silent_notif_checkbox.blockSignals(False)
-        self.meal_plan_ai_checkbox.blockSignals(False)
+        with (
+            QSignalBlocker(self.startup_checkbox),
+            QSignalBlocker(self.food_ai_checkbox),
+            QSignalBlocker(self.exercise_ai_checkbox),
+            QSignalBlocker(self.silent_notif_checkbox),
+            QSignalBlocker(self.meal_plan_ai_checkbox),
+        ):
+            # Load checkbox states from the in-memory cache (defaults to False if not found)
+            for checkbox, key in checkboxes:
+                checkbox.setChecked(self.cached_settings[key])
     
-    def save_settings(self):
+    def save_setting(self, key: str, checked: bool):
         """
-        Save current checkbox states to persistent storage.
-        Saves food_ai_enabled, exercise_ai_enabled, silent_notif_enabled,
-        and meal_plan_ai_enabled settings. Note: startup_enabled is saved separately.
+        Save a single checkbox state to persistent storage.
+        Updates the in-memory cache and QSettings, then schedules a sync rather
+        than flushing immediately.
+        
+        Args:
+            key (str): The settings key, e.g. "food_ai_enabled".
+            checked (bool): The new checkbox state.
         """
-        self.settings.setValue("food_ai_enabled", self.food_ai_checkbox.isChecked())
-        self.settings.setValue("exercise_ai_enabled", self.exercise_ai_checkbox.isChecked())
-        self.settings.setValue("silent_notif_enabled", self.silent_notif_checkbox.isChecked())
-        self.settings.setValue("meal_plan_ai_enabled", self.meal_plan_ai_checkbox.isChecked())
-        self.settings.sync()
+        self.cached_settings[key] = checked
+        self.settings.setValue(key, checked)
+        self.schedule_sync()
+
+    def schedule_sync(self):
+        """
+        Schedule a QSettings sync.
+        If a sync is already pending, it will pick up this change too, so nothing else is needed.
+        """
+        if not self.sync_timer.isActive():
+            self.sync_timer.start()
     
     def save_startup_setting(self):
         """
         Save startup checkbox state separately.
-        This is called separately from save_settings because startup requires
+        This is called separately from the other checkboxes because startup requires
         special handling with the Windows registry.
         """
-        self.settings.setValue("startup_enabled", self.startup_checkbox.isChecked())
-        self.settings.sync()
+        self.save_setting("startup_enabled", self.startup_checkbox.isChecked())
 
     def import_database(self):
         """
@@ -182,27 +198,66 @@ class Settings(QWidget):
         """
         # File explorer for user to find the database file to import (might need to make an export for exe users who dont have the loose source files)
         file_path, _ = QFileDialog.getOpenFileName(self, "Import Database", "", "Database Files (*.db)")
-        if file_path:
-            try:
-                # Backup existing database if it exists
-                if os.path.exists("health_app.db"):
-                    backup_path = f"health_app_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
-                    shutil.copy("health_app.db", backup_path)
-                
-                # Copy the imported database file to the app's directory
-                shutil.copy(file_path, "health_app.db")
-                
-                QMessageBox.information(
-                    self,
-                    "Database Imported",
-                    "Database imported successfully!\n\nPlease restart the application to see the changes."
-                )
-            except Exception as e:
-                QMessageBox.warning(
-                    self,
-                    "Import Error",
-                    f"Failed to import database:\n{str(e)}"
-                )
+        if not file_path:
+            return
+
+        # Copying a large database can take a while, so do it on a background thread and show a busy indicator meanwhile
+        self.import_progress_dialog = QProgressDialog("Importing database...", None, 0, 0, self)
+        self.import_progress_dialog.setWindowTitle("Import Database")
+        self.import_progress_dialog.setWindowModality(Qt.WindowModality.WindowModal)
+        self.import_progress_dialog.setMinimumDuration(0)
+        self.import_progress_dialog.show()
+        run_in_background(
+            self,
+            self._copy_imported_database,
+            file_path,
+            on_finished=self.import_database_on_finished,
+            on_error=self.import_database_on_error,
+        )
+
+    @staticmethod
+    def _copy_imported_database(file_path: str):
+        """
+        Back up the current database and replace it with the imported one.
+        Runs in a background thread, so it must not touch any widgets.
+
+        Args:
+            file_path (str): The path of the database file to import.
+        """
+        # Backup existing database if it exists
+        if os.path.exists("health_app.db"):
+            backup_path = f"health_app_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}.db"
+            # copyfile only copies the contents (no permission bits) and uses the OS's fast copy path where available
+            shutil.copyfile("health_app.db", backup_path)
+
+        # Copy the imported database file to the app's directory
+        shutil.copyfile(file_path, "health_app.db")
+
+    def import_database_on_finished(self, _result=None):
+        """
+        Handle the background database import finishing successfully.
+        """
+        self.import_progress_dialog.close()
+        QMessageBox.information(
+            self,
+            "Database Imported",
+            "Database imported successfully!\n\nPlease restart the application to see the changes."
+        )
+
+    def import_database_on_error(self, error_message):
+        """
+        Handle the background database import failing.
+
+        Args:
+            error_message (str): The error message from the background worker.
+        """
+        self.import_progress_dialog.close()
+        # The worker prefixes its messages with "Error: ", which the dialog text already says
+        QMessageBox.warning(
+            self,
+            "Import Error",
+            f"Failed to import database:\n{error_message.removeprefix('Error: ')}"
+        )
 
     def export_database(self):
         """
@@ -224,7 +279,7 @@ class Settings(QWidget):
         )
         if file_path:
             try:
-                shutil.copy(db_path, file_path)
+                shutil.copyfile(db_path, file_path)
                 QMessageBox.information(
                     self,
                     "Database Exported",
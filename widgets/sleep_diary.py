@@ -2,15 +2,18 @@
 SleepDiary widget for the Health App.
 '''
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox, QSplitter, QLabel, QTableWidget, QAbstractItemView, 
-    QDialog, QDialogButtonBox, QFormLayout, QDateEdit, QTimeEdit, QTableWidgetItem, QDateTimeEdit,
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QComboBox, QSplitter, QLabel, QTableView,
+    QDialog, QDialogButtonBox, QFormLayout, QDateEdit, QTimeEdit, QDateTimeEdit,
     QMessageBox, QInputDialog,
 )
-from PyQt6.QtGui import QShortcut, QKeySequence, QBrush, QColor
-from PyQt6.QtCore import Qt, QDate, QTime, QDateTime
-from database import get_sleep_diary_entries, get_earliest_sleep_diary_date, add_sleep_diary_entry, delete_sleep_diary_entry, update_sleep_diary_entry
+from PyQt6.QtGui import QShortcut, QKeySequence
+from PyQt6.QtCore import Qt, QDate, QTime, QDateTime, QTimer
+from database import get_sleep_diary_entries, get_earliest_sleep_diary_date, add_sleep_diary_entry, delete_sleep_diary_entry, delete_sleep_diary_entries, update_sleep_diary_entry, get_sleep_diary_version, get_sleep_diary_averages
 from config import calories_burned_red, hover_light_green
-from utils import get_timeframe_dates
+from utils import get_timeframe_dates, time_to_seconds, run_in_background
+from widgets.sleep_diary_table_model import SleepDiaryTableModel
+
+_INVALID_DURATION_MESSAGE = "Wakeup must be after bedtime and less than 24 hours later."
 
 
 class SleepDiary(QWidget):
@@ -74,18 +77,25 @@ class SleepDiary(QWidget):
         # Table section to show entries for a given date
         self.table_layout = QVBoxLayout()
 
-        self.table = QTableWidget()
-        self.table.setColumnCount(4)
-        self.table.setHorizontalHeaderLabels(["Night", "Bedtime", "Wakeup", "Sleep Duration"])
-        # Disable editing cells by double-clicking as found a user could edit the info locally. While it isnt saved to database its undesirable behaviour.
-        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        # Recommended sleep for 18-64 year olds is 7-9 hours. As this age range is so broad I dont think need to use AI or anything to narrow it down
+        self.reccomended_hours_min_sleep = 7
+        self.reccomended_hours_max_sleep = 9
+        # Convert to seconds for precise comparison
+        self.reccomended_seconds_min_sleep = self.reccomended_hours_min_sleep * 3600  # 7 hours = 25200 seconds
+        self.reccomended_seconds_max_sleep = self.reccomended_hours_max_sleep * 3600  # 9 hours = 32400 seconds
+
+        # The table is a view over a model holding the raw rows, so cells are only formatted when they are shown.
+        # The model doesn't mark cells as editable, as found a user could edit the info locally. While it isnt saved to database its undesirable behaviour.
+        self.table = QTableView()
+        self.table_model = SleepDiaryTableModel(self.reccomended_seconds_min_sleep, self.reccomended_seconds_max_sleep, self)
+        self.table.setModel(self.table_model)
         
         # Enable automatic column resizing to fit content
-        self.table.horizontalHeader().setStretchLastSection(False)
-        self.table.horizontalHeader().setSectionResizeMode(0, self.table.horizontalHeader().ResizeMode.Stretch) 
-        self.table.horizontalHeader().setSectionResizeMode(1, self.table.horizontalHeader().ResizeMode.Stretch) 
-        self.table.horizontalHeader().setSectionResizeMode(2, self.table.horizontalHeader().ResizeMode.Stretch) 
-        self.table.horizontalHeader().setSectionResizeMode(3, self.table.horizontalHeader().ResizeMode.Stretch) 
+        header = self.table.horizontalHeader()
+        header.setStretchLastSection(False)
+        stretch = header.ResizeMode.Stretch
+        for column in range(self.table_model.columnCount()):
+            header.setSectionResizeMode(column, stretch)
         self.table.setWordWrap(True) # Enable word wrapping for long food names
  
         # Enable keyboard focus and selection
@@ -131,6 +141,21 @@ class SleepDiary(QWidget):
         ]:
             self.stat_2_layout.addWidget(label)
 
+        # Every label load_stats writes to, in a fixed order so their text and styling can be cached together
+        self.stats_labels = (
+            self.weekday_bedtime_label,
+            self.weekday_wakeup_label,
+            self.weekday_sleep_duration_label,
+            self.weekend_bedtime_label,
+            self.weekend_wakeup_label,
+            self.weekend_sleep_duration_label,
+            self.overall_bedtime_label,
+            self.overall_wakeup_label,
+            self.overall_sleep_duration_label,
+            self.sufficient_streak_label,
+            self.percent_of_day_sleep_label,
+        )
+
         self.stats_layout.addLayout(self.stat_1_layout)
         self.stats_layout.addLayout(self.stat_2_layout)
 
@@ -145,14 +170,46 @@ class SleepDiary(QWidget):
         self.layout.addWidget(self.sleep_diary_splitter)
         self.setLayout(self.layout)
         
-        # Recommended sleep for 18-64 year olds is 7-9 hours. As this age range is so broad I dont think need to use AI or anything to narrow it down
-        self.reccomended_hours_min_sleep = 7
-        self.reccomended_hours_max_sleep = 9
-        # Convert to seconds for precise comparison
-        self.reccomended_seconds_min_sleep = self.reccomended_hours_min_sleep * 3600  # 7 hours = 25200 seconds
-        self.reccomended_seconds_max_sleep = self.reccomended_hours_max_sleep * 3600  # 9 hours = 32400 seconds
-        
-        self.load_table()
+
+        # Entries already fetched for each timeframe, keyed by (start, end) julian days.
+        # Only valid for the sleep_diary table version they were fetched at, so cleared when that changes.
+        self._entries_cache = {}
+        self._entries_cache_version = -1
+        # The current timeframe's (start, end) dates and the (timeframe, today, table version) they were worked out for
+        self._timeframe_dates = None
+        self._timeframe_dates_key = None
+        # Earliest night in the diary and the sleep_diary table version it was read at
+        self._earliest_date = None
+        self._earliest_date_version = -1
+        # (text, style sheet) of every stats label for each timeframe, valid for the same table version as the entries cache
+        self._stats_cache = {}
+        self._stats_cache_version = -1
+        # Add and edit dialogs, each built on first use as (dialog, message_label, night_input, bedtime_input, wakeup_input)
+        self._add_entry_dialog = None
+        self._edit_entry_dialog = None
+
+        # Single-shot timer so holding a navigation key down (auto-repeat) only loads the timeframe it stops on
+        self.table_reload_timer = QTimer(self)
+        self.table_reload_timer.setSingleShot(True)
+        self.table_reload_timer.setInterval(80)
+        self.table_reload_timer.timeout.connect(self.load_table)
+        # Reload whenever the timeframe actually changes, whether from the selector, the buttons or the shortcuts.
+        # Pressing back or next when already at the first or last timeframe changes nothing, so doesn't reload.
+        self.timeframe_selector.currentIndexChanged.connect(self.schedule_load_table)
+
+        # The table is loaded the first time the page is shown rather than while the main window is being built
+        self._loaded = False
+
+    def showEvent(self, event):
+        """
+        Load the table the first time the sleep diary is shown.
+
+        Args:
+            event (QShowEvent): The show event.
+        """
+        super().showEvent(event)
+        if not self._loaded:
+            self.load_table()
 
     def back(self):
         """
@@ -162,7 +219,6 @@ class SleepDiary(QWidget):
         current_index = self.timeframe_selector.currentIndex()
         if current_index > 0:
             self.timeframe_selector.setCurrentIndex(current_index - 1)
-        self.load_table()
 
     def next(self):
         """
@@ -173,35 +229,111 @@ class SleepDiary(QWidget):
         last_index = self.timeframe_selector.count() - 1
         if current_index < last_index:
             self.timeframe_selector.setCurrentIndex(current_index + 1)
-        self.load_table()
+
+    def schedule_load_table(self):
+        """
+        Request a reload of the table for the selected timeframe.
+        Restarts the debounce timer so that several requests within a short
+        window result in a single call to load_table.
+        """
+        self.table_reload_timer.start()
 
     def add_entry(self):
         """
         Add a new entry to the sleep diary.
+        The dialog is built on first use and reused afterwards, with its inputs reset each time.
+        """
+        if self._add_entry_dialog is None:
+            self._add_entry_dialog = self._build_entry_dialog(
+                "Add Sleep Entry", "What night is this sleep entry for? When did you go to bed and wake up?"
+            )
+        today = QDate.currentDate()
+        # Waking up happens the morning after the night the entry is for
+        values = self._prompt_entry(
+            self._add_entry_dialog, "Add Entry",
+            today, QDateTime(today, QTime(22, 0)), QDateTime(today.addDays(1), QTime(9, 0)),
+        )
+        if values is None:
+            return
+
+        # Save on a background thread so the GUI stays responsive, and insert the row once it's done
+        run_in_background(
+            self,
+            self._save_entry,
+            *values,
+            on_finished=self.add_entry_on_saved,
+            on_error=self.add_entry_on_error,
+        )
+
+    @classmethod
+    def _save_entry(cls, sleep_date: QDate, bedtime: QDateTime, wakeup: QDateTime, sleep_duration: QTime) -> tuple:
+        """
+        Save a new entry to the database. Runs on a background thread, so must not touch any widgets.
+
+        Args:
+            sleep_date (QDate): The sleep date.
+            bedtime (QDateTime): The bedtime.
+            wakeup (QDateTime): The wakeup time.
+            sleep_duration (QTime): The sleep duration.
+
+        Returns:
+            tuple: The new entry as a table row, see _entry_row.
+        """
+        entry_id = add_sleep_diary_entry(sleep_date, bedtime, wakeup, sleep_duration)
+        return cls._entry_row(entry_id, sleep_date, bedtime, wakeup, sleep_duration)
+
+    def add_entry_on_saved(self, entry: tuple):
+        """
+        Handle the background save of a new entry finishing.
+
+        Args:
+            entry (tuple): The new entry as a table row.
+        """
+        # Only one row changed, so insert it into the table rather than reloading every row
+        if self._in_timeframe(entry[1]):
+            self.table_model.insert_entry(entry)
+        self.refresh_stats()
+
+    def add_entry_on_error(self, error_message):
+        """
+        Handle the background save of a new entry failing.
+
+        Args:
+            error_message (str): The error message from the background worker.
+        """
+        QMessageBox.warning(self, "Add Entry", f"Failed to add sleep entry:\n{error_message.removeprefix('Error: ')}")
+
+    def _build_entry_dialog(self, title: str, message: str):
+        """
+        Build a dialog for entering a night, bedtime and wakeup, used by add_entry and edit_entry.
+
+        Args:
+            title (str): The window title.
+            message (str): The message shown above the inputs.
+
+        Returns:
+            tuple: (dialog, message_label, night_input, bedtime_input, wakeup_input)
         """
         dialog = QDialog(self)
-        dialog.setWindowTitle("Add Sleep Entry")
+        dialog.setWindowTitle(title)
         dialog.setModal(True)
 
-        layout = QVBoxLayout()
+        layout = QVBoxLayout(dialog)
         layout.setContentsMargins(20, 20, 20, 20)
         layout.setSpacing(12)
 
-        message_label = QLabel("What night is this sleep entry for? When did you go to bed and wake up?")
+        message_label = QLabel(message)
         message_label.setWordWrap(True)
         layout.addWidget(message_label)
 
         input_layout = QFormLayout()
         night_input = QDateEdit(dialog)
-        night_input.setDate(QDate.currentDate())
         night_input.setDisplayFormat("dd-MM-yyyy")
         input_layout.addRow("Night:", night_input)
         bedtime_input = QDateTimeEdit(dialog)
         input_layout.addRow("Bedtime:", bedtime_input)
-        bedtime_input.setDateTime(QDateTime(QDate.currentDate(), QTime(22, 0)))
         wakeup_input = QDateTimeEdit(dialog)
         input_layout.addRow("Wakeup:", wakeup_input)
-        wakeup_input.setDateTime(QDateTime(QDate.currentDate(), QTime(9, 0)))
         layout.addLayout(input_layout)
 
         button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
@@ -213,26 +345,13 @@ class SleepDiary(QWidget):
         button_box.rejected.connect(dialog.reject)
         layout.addWidget(button_box)
 
-        dialog.setLayout(layout)
-
-        if dialog.exec() != QDialog.DialogCode.Accepted:
-            return
-        
-        sleep_date = night_input.date()
-        bedtime = bedtime_input.dateTime()
-        wakeup = wakeup_input.dateTime()
-        secs = wakeup.toSecsSinceEpoch() - bedtime.toSecsSinceEpoch()
-        hours = secs / 3600
-        minutes = (secs % 3600) / 60
-        sleep_duration = QTime(int(hours), int(minutes))
-        add_sleep_diary_entry(sleep_date, bedtime, wakeup, sleep_duration)
-        self.load_table()
+        return dialog, message_label, night_input, bedtime_input, wakeup_input
 
     def remove_entry_button_clicked(self):
         """
         Remove an entry from the sleep diary.
         """
-        row_count = self.table.rowCount()
+        row_count = self.table_model.rowCount()
         if row_count == 0:
             QMessageBox.information(self, "Remove Entry", "There are no entries to remove.")
             return
@@ -247,19 +366,15 @@ class SleepDiary(QWidget):
         if not ok:
             return
 
-        # Get IDs for this timeframe
-        start_qdate, end_qdate = self.get_timeframe_dates()
-        rows = get_sleep_diary_entries(start_qdate, end_qdate)
-        ids = [row[0] for row in rows]
-
         index = row_number - 1
-        if index < 0 or index >= len(ids):
+        if index < 0 or index >= row_count:
             QMessageBox.warning(self, "Remove Entry", "Invalid row number.")
             return
 
-        delete_sleep_diary_entry(ids[index])
+        delete_sleep_diary_entry(self.table_model.entry_id(index))
 
-        self.load_table()
+        self.table_model.remove_rows([index])
+        self.refresh_stats()
 
     def keyPressEvent(self, event):
         """
@@ -293,15 +408,11 @@ class SleepDiary(QWidget):
         if reply == QMessageBox.StandardButton.No:
             return
 
-        start_qdate, end_qdate = self.get_timeframe_dates()
-        rows = get_sleep_diary_entries(start_qdate, end_qdate)
-        ids = [row[0] for row in rows]
-
-        for row_index in selected_rows:
-            if row_index < len(ids):
-                delete_sleep_diary_entry(ids[row_index])
+        # Delete all the selected entries in one statement rather than one transaction per row
+        delete_sleep_diary_entries([self.table_model.entry_id(row_index) for row_index in selected_rows])
         
-        self.load_table()
+        self.table_model.remove_rows(selected_rows)
+        self.refresh_stats()
 
     def edit_entry(self):
         """
@@ -312,7 +423,7 @@ class SleepDiary(QWidget):
 
         # If no rows or more than one row selected, prompt user to select a row to edit.
         if len(selected_rows) != 1:
-            row_count = self.table.rowCount()
+            row_count = self.table_model.rowCount()
             if row_count == 0:
                 QMessageBox.information(self, "Edit Entry", "There are no entries to edit.")
                 return
@@ -329,117 +440,242 @@ class SleepDiary(QWidget):
         else:
             index = selected_rows[0]
 
-        # Get IDs for this timeframe
-        start_qdate, end_qdate = self.get_timeframe_dates()
-        row_to_edit = get_sleep_diary_entries(start_qdate, end_qdate)[index]
+        # Get the entry shown in this row of the table
+        row_to_edit = self.table_model.entry(index)
 
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Edit Sleep Entry")
-        dialog.setModal(True)
-
-        layout = QVBoxLayout()
-        layout.setContentsMargins(20, 20, 20, 20)
-        layout.setSpacing(12)
+        if self._edit_entry_dialog is None:
+            self._edit_entry_dialog = self._build_entry_dialog("Edit Sleep Entry", "")
+        self._edit_entry_dialog[1].setText(f"Edit the sleep entry for the night of {row_to_edit[1]}:")
 
-        
-        message_label = QLabel(f"Edit the sleep entry for the night of {row_to_edit[1]}:")
-        message_label.setWordWrap(True)
-        layout.addWidget(message_label)
-        input_layout = QFormLayout()
-        night_input = QDateEdit(dialog)
-        night_input.setDate(QDate.fromString(row_to_edit[1], "yyyy-MM-dd"))
-        night_input.setDisplayFormat("dd-MM-yyyy")
-        input_layout.addRow("Night:", night_input)
         # Parse the date and times from the database row
         sleep_date_qdate = QDate.fromString(row_to_edit[1], "yyyy-MM-dd")
         bedtime_qtime = QTime.fromString(row_to_edit[2], "HH:mm")
         wakeup_qtime = QTime.fromString(row_to_edit[3], "HH:mm")
-        
-        # Create QDateTime objects by combining QDate and QTime
-        bedtime_input = QDateTimeEdit(dialog)
-        input_layout.addRow("Bedtime:", bedtime_input)
-        bedtime_input.setDateTime(QDateTime(sleep_date_qdate, bedtime_qtime))
-        
-        wakeup_input = QDateTimeEdit(dialog)
-        input_layout.addRow("Wakeup:", wakeup_input)
-        wakeup_input.setDateTime(QDateTime(sleep_date_qdate, wakeup_qtime))
-        layout.addLayout(input_layout)
+        # Only the times are stored, so a wakeup that isn't later than bedtime was the next morning
+        wakeup_qdate = sleep_date_qdate if wakeup_qtime > bedtime_qtime else sleep_date_qdate.addDays(1)
+        values = self._prompt_entry(
+            self._edit_entry_dialog, "Edit Entry",
+            sleep_date_qdate, QDateTime(sleep_date_qdate, bedtime_qtime), QDateTime(wakeup_qdate, wakeup_qtime),
+        )
+        if values is None:
+            return
 
-        button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel)
-        add_button = button_box.button(QDialogButtonBox.StandardButton.Ok)
-        cancel_button = button_box.button(QDialogButtonBox.StandardButton.Cancel)
-        add_button.setText("Add")
-        cancel_button.setText("Cancel")
-        button_box.accepted.connect(dialog.accept)
-        button_box.rejected.connect(dialog.reject)
-        layout.addWidget(button_box)
-        dialog.setLayout(layout)
+        sleep_date, bedtime, wakeup, sleep_duration = values
+        update_sleep_diary_entry(row_to_edit[0], sleep_date, bedtime, wakeup, sleep_duration)
+        # Only update the edited row. If the night changed it may need to move, or leave the timeframe entirely.
+        entry = self._entry_row(row_to_edit[0], sleep_date, bedtime, wakeup, sleep_duration)
+        if entry[1] == row_to_edit[1]:
+            self.table_model.update_entry(index, entry)
+        else:
+            self.table_model.remove_rows([index])
+            if self._in_timeframe(entry[1]):
+                self.table_model.insert_entry(entry)
+        self.refresh_stats()
+
+    def _prompt_entry(self, entry_dialog: tuple, title: str, night: QDate, bedtime: QDateTime, wakeup: QDateTime):
+        """
+        Show an entry dialog filled in with the given values and read back what the user entered.
+
+        Args:
+            entry_dialog (tuple): The dialog and its widgets, as returned by _build_entry_dialog.
+            title (str): The title of the warning shown if the times are invalid.
+            night (QDate): The night to start with.
+            bedtime (QDateTime): The bedtime to start with.
+            wakeup (QDateTime): The wakeup time to start with.
+
+        Returns:
+            tuple or None: (sleep_date, bedtime, wakeup, sleep_duration), or None if the dialog was
+                cancelled or the times don't give a valid sleep duration.
+        """
+        dialog, _, night_input, bedtime_input, wakeup_input = entry_dialog
+        night_input.setDate(night)
+        bedtime_input.setDateTime(bedtime)
+        wakeup_input.setDateTime(wakeup)
 
         if dialog.exec() != QDialog.DialogCode.Accepted:
-            return
+            return None
 
-        sleep_date = night_input.date()
         bedtime = bedtime_input.dateTime()
         wakeup = wakeup_input.dateTime()
-        secs = wakeup.toSecsSinceEpoch() - bedtime.toSecsSinceEpoch()
-        hours = secs / 3600
-        minutes = (secs % 3600) / 60
-        sleep_duration = QTime(int(hours), int(minutes))
-        update_sleep_diary_entry(row_to_edit[0], sleep_date, bedtime, wakeup, sleep_duration)
-        self.load_table()
+        sleep_duration = self._sleep_duration(bedtime, wakeup)
+        if sleep_duration is None:
+            QMessageBox.warning(self, title, _INVALID_DURATION_MESSAGE)
+            return None
+        return night_input.date(), bedtime, wakeup, sleep_duration
+
+    @staticmethod
+    def _sleep_duration(bedtime: QDateTime, wakeup: QDateTime):
+        """
+        Work out how long was slept between bedtime and wakeup.
+        A QTime can only hold up to 23:59, so durations outside that range are rejected rather than
+        being saved as an invalid time.
+
+        Args:
+            bedtime (QDateTime): The bedtime.
+            wakeup (QDateTime): The wakeup time.
+
+        Returns:
+            QTime or None: The sleep duration to the minute, or None if wakeup isn't after bedtime or is a day or more later.
+        """
+        secs = bedtime.secsTo(wakeup)
+        if secs <= 0 or secs >= 86400:
+            return None
+        hours, remainder = divmod(secs, 3600)
+        return QTime(hours, remainder // 60)
+
+    @staticmethod
+    def _entry_row(entry_id: int, sleep_date: QDate, bedtime: QDateTime, wakeup: QDateTime, sleep_duration: QTime) -> tuple:
+        """
+        Build a table row for an entry in the same format the database returns it.
+
+        Args:
+            entry_id (int): The id of the sleep diary entry.
+            sleep_date (QDate): The sleep date.
+            bedtime (QDateTime): The bedtime.
+            wakeup (QDateTime): The wakeup time.
+            sleep_duration (QTime): The sleep duration.
+
+        Returns:
+            tuple: (id, sleep_date, bedtime, wakeup, sleep_duration) with "yyyy-MM-dd" and "HH:mm" strings.
+        """
+        return (
+            entry_id,
+            sleep_date.toString("yyyy-MM-dd"),
+            bedtime.toString("HH:mm"),
+            wakeup.toString("HH:mm"),
+            sleep_duration.toString("HH:mm"),
+        )
+
+    def _in_timeframe(self, sleep_date: str) -> bool:
+        """
+        Check whether a night falls within the current timeframe.
+
+        Args:
+            sleep_date (str): The night in "yyyy-MM-dd" format.
+
+        Returns:
+            bool: True if the night is shown for the current timeframe.
+        """
+        start_qdate, end_qdate = self.get_timeframe_dates()
+        return start_qdate.toString("yyyy-MM-dd") <= sleep_date <= end_qdate.toString("yyyy-MM-dd")
 
     def get_timeframe_dates(self):
         """
         Get the start and end dates for the current timeframe.
+        The dates only change when the timeframe, the day or the entries change (the
+        earliest entry bounds the range), so they are reused until one of those does.
+
         Returns:
             tuple: (start_qdate, end_qdate)
         """
-        return get_timeframe_dates(self.timeframe_selector, get_earliest_sleep_diary_date)
+        today = QDate.currentDate()
+        key = (self.timeframe_selector.currentText(), today.toJulianDay(), get_sleep_diary_version())
+        if key != self._timeframe_dates_key:
+            self._timeframe_dates = get_timeframe_dates(self.timeframe_selector, self.get_earliest_date, end_qdate=today)
+            self._timeframe_dates_key = key
+        return self._timeframe_dates
+
+    def get_earliest_date(self):
+        """
+        Get the earliest night in the sleep diary.
+        Read once per sleep_diary table version, so switching between timeframes doesn't query it again.
+
+        Returns:
+            str or None: The earliest date in "yyyy-MM-dd" format, or None if the diary is empty.
+        """
+        version = get_sleep_diary_version()
+        if version != self._earliest_date_version:
+            self._earliest_date = get_earliest_sleep_diary_date()
+            self._earliest_date_version = version
+        return self._earliest_date
+
+    def get_entries(self):
+        """
+        Get the sleep diary entries for the current timeframe.
+        Entries are cached per timeframe, so the table, stats and edit/remove actions
+        share one query until the sleep_diary table is next modified.
+
+        Returns:
+            list: The rows for the timeframe as (id, sleep_date, bedtime, wakeup, sleep_duration) tuples.
+        """
+        version = get_sleep_diary_version()
+        if version != self._entries_cache_version:
+            self._entries_cache.clear()
+            self._entries_cache_version = version
+
+        start_qdate, end_qdate = self.get_timeframe_dates()
+        key = (start_qdate.toJulianDay(), end_qdate.toJulianDay())
+        rows = self._entries_cache.get(key)
+        if rows is None:
+            rows = self._entries_cache[key] = get_sleep_diary_entries(start_qdate, end_qdate)
+        return rows
 
     def load_table(self):
         """
         Load the table with the sleep diary entries from the database.
         """
-        
-        start_qdate, end_qdate = self.get_timeframe_dates()
-        rows = get_sleep_diary_entries(start_qdate, end_qdate)
-
-        self.table.setRowCount(len(rows))
-        for i, row in enumerate(rows):
-           # row[0] is "yyyy-MM-dd" from the DB - parse it correctly
-           qdate = QDate.fromString(row[1], "yyyy-MM-dd")
-           if qdate.isValid():
-               display_date = qdate.toString("dd-MM-yyyy")
-           else:
-               # Fallback if date format is unexpected
-               display_date = row[1]
-           self.table.setItem(i, 0, QTableWidgetItem(display_date))
-           self.table.setItem(i, 1, QTableWidgetItem(row[2]))  # bedtime
-           self.table.setItem(i, 2, QTableWidgetItem(row[3]))  # wakeup
-           
-           # Sleep duration with color coding using QLabel widget for reliable styling
-           duration_qtime = QTime.fromString(row[4], "HH:mm")
-           duration_label = QLabel(row[4])
-           duration_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-           if duration_qtime.isValid():
-               # Convert to total seconds for precise comparison
-               duration_seconds = duration_qtime.hour() * 3600 + duration_qtime.minute() * 60
-               # Apply color based on recommended range (7-9 hours = 25200-32400 seconds)
-               if duration_seconds < self.reccomended_seconds_min_sleep or duration_seconds > self.reccomended_seconds_max_sleep:
-                   duration_label.setStyleSheet(f"color: {calories_burned_red};")
-               else:
-                   duration_label.setStyleSheet(f"color: {hover_light_green};")
-           self.table.setCellWidget(i, 3, duration_label)
-        self.load_stats()
-
-    def load_stats(self):
+        self._loaded = True
+        rows = self.get_entries()
+        self.table_model.set_rows(rows)
+        self.load_stats(rows)
+
+    def refresh_stats(self):
+        """
+        Recalculate the stats for the rows currently shown in the table,
+        used after the table has been updated in place.
+        """
+        self.load_stats(self.table_model.entries())
+
+    def load_stats(self, rows=None):
         """
         Load the stats for the sleep diary.
         Calculates average bedtime, wakeup time, and sleep duration for the current timeframe.
+        The resulting labels are cached per timeframe, so returning to a timeframe whose
+        entries haven't changed just restores them.
+
+        Args:
+            rows (list, optional): The entries for the current timeframe, if already fetched.
         """
+        version = get_sleep_diary_version()
+        if version != self._stats_cache_version:
+            self._stats_cache.clear()
+            self._stats_cache_version = version
+
         start_qdate, end_qdate = self.get_timeframe_dates()
-        rows = get_sleep_diary_entries(start_qdate, end_qdate)
+        key = (start_qdate.toJulianDay(), end_qdate.toJulianDay())
+        cached = self._stats_cache.get(key)
+        if cached is not None:
+            for label, (text, style_sheet) in zip(self.stats_labels, cached):
+                label.setText(text)
+                self._set_style_sheet(label, style_sheet)
+            return
+
+        if rows is None:
+            rows = self.get_entries()
+        self.calculate_stats(rows)
+        self._stats_cache[key] = [(label.text(), label.styleSheet()) for label in self.stats_labels]
 
+    @staticmethod
+    def _set_style_sheet(label: QLabel, style_sheet: str):
+        """
+        Set a stats label's style sheet only if it is different.
+        Setting a style sheet re-polishes the label even when it is unchanged, whereas QLabel.setText
+        already ignores identical text.
+
+        Args:
+            label (QLabel): The label to style.
+            style_sheet (str): The style sheet to apply.
+        """
+        if label.styleSheet() != style_sheet:
+            label.setStyleSheet(style_sheet)
+
+    def calculate_stats(self, rows):
+        """
+        Calculate the stats for the given entries and show them in the stats labels.
+
+        Args:
+            rows (list): The entries for the current timeframe.
+        """
         if not rows:
             self.weekday_bedtime_label.setText("Weekdays - Average Bedtime: --:--")
             self.weekday_wakeup_label.setText("Weekdays - Average Wakeup: --:--")
@@ -457,87 +693,36 @@ class SleepDiary(QWidget):
                 self.weekend_sleep_duration_label,
                 self.overall_sleep_duration_label,
             ):
-                lbl.setStyleSheet("")
+                self._set_style_sheet(lbl, "")
             return
 
-        # Accumulators for weekday, weekend, and overall
-        stats = {
-            "weekday": {"bed": [], "wake": [], "dur": []},
-            "weekend": {"bed": [], "wake": [], "dur": []},
-            "all": {"bed": [], "wake": [], "dur": []},
-        }
-
-        # Helper to add seconds to category lists
-        def add_to_category(cat_key, bedtime_secs, wakeup_secs, duration_secs):
-            if bedtime_secs is not None:
-                stats[cat_key]["bed"].append(bedtime_secs)
-            if wakeup_secs is not None:
-                stats[cat_key]["wake"].append(wakeup_secs)
-            if duration_secs is not None:
-                stats[cat_key]["dur"].append(duration_secs)
-
-        for row in rows:
-            # row[1] = sleep_date "yyyy-MM-dd", row[2] = bedtime "HH:mm",
-            # row[3] = wakeup "HH:mm", row[4] = duration "HH:mm"
-            date_qdate = QDate.fromString(row[1], "yyyy-MM-dd")
-            bedtime_qtime = QTime.fromString(row[2], "HH:mm")
-            wakeup_qtime = QTime.fromString(row[3], "HH:mm")
-            duration_qtime = QTime.fromString(row[4], "HH:mm")
-
-            bedtime_secs = None
-            wakeup_secs = None
-            duration_secs = None
-
-            if bedtime_qtime.isValid():
-                bedtime_secs = bedtime_qtime.hour() * 3600 + bedtime_qtime.minute() * 60
-                # If bedtime is between 00:00-06:00, treat as next day (add 24 hours)
-                if bedtime_qtime.hour() < 6:
-                    bedtime_secs += 24 * 3600
-
-            if wakeup_qtime.isValid():
-                wakeup_secs = wakeup_qtime.hour() * 3600 + wakeup_qtime.minute() * 60
-
-            if duration_qtime.isValid():
-                duration_secs = duration_qtime.hour() * 3600 + duration_qtime.minute() * 60
-
-            # Determine weekday vs weekend (1=Mon ... 7=Sun)
-            if date_qdate.isValid():
-                if date_qdate.dayOfWeek() in (6, 7):
-                    categories = ["weekend", "all"]
-                else:
-                    categories = ["weekday", "all"]
-            else:
-                categories = ["all"]
-
-            for cat in categories:
-                add_to_category(cat, bedtime_secs, wakeup_secs, duration_secs)
+        # Averages are summed by the database, so only three rows come back however long the timeframe is
+        start_qdate, end_qdate = self.get_timeframe_dates()
+        averages = get_sleep_diary_averages(start_qdate, end_qdate)
 
         # Helper to compute average bedtime, wakeup, and duration labels
         def format_time_from_seconds(avg_secs):
-            avg_secs = avg_secs % (24 * 3600)
-            qtime = QTime(0, 0, 0).addSecs(int(avg_secs))
-            return qtime.toString("HH:mm")
+            hours, minutes = divmod(int(avg_secs % (24 * 3600)) // 60, 60)
+            return f"{hours:02d}:{minutes:02d}"
 
         def format_duration_from_seconds(avg_secs):
             hours = int(avg_secs // 3600)
             minutes = int((avg_secs % 3600) // 60)
             return hours, minutes
 
-        def update_labels_for_category(prefix, data, bedtime_label, wakeup_label, duration_label):
-            if data["bed"]:
-                avg_bed_secs = sum(data["bed"]) / len(data["bed"])
+        def update_labels_for_category(prefix, category_averages, bedtime_label, wakeup_label, duration_label):
+            avg_bed_secs, avg_wake_secs, avg_dur_secs = category_averages or (None, None, None)
+            if avg_bed_secs is not None:
                 bedtime_label.setText(f"{prefix} - Average Bedtime: {format_time_from_seconds(avg_bed_secs)}")
             else:
                 bedtime_label.setText(f"{prefix} - Average Bedtime: --:--")
 
-            if data["wake"]:
-                avg_wake_secs = sum(data["wake"]) / len(data["wake"])
+            if avg_wake_secs is not None:
                 wakeup_label.setText(f"{prefix} - Average Wakeup: {format_time_from_seconds(avg_wake_secs)}")
             else:
                 wakeup_label.setText(f"{prefix} - Average Wakeup: --:--")
 
-            if data["dur"]:
-                avg_dur_secs = sum(data["dur"]) / len(data["dur"])
+            if avg_dur_secs is not None:
                 h, m = format_duration_from_seconds(avg_dur_secs)
                 duration_label.setText(f"{prefix} - Average Sleep Duration: {h}h {m}m")
             else:
@@ -546,21 +731,21 @@ class SleepDiary(QWidget):
         # Update weekday, weekend, and overall labels
         update_labels_for_category(
             "Weekdays",
-            stats["weekday"],
+            averages["weekday"],
             self.weekday_bedtime_label,
             self.weekday_wakeup_label,
             self.weekday_sleep_duration_label,
         )
         update_labels_for_category(
             "Weekends",
-            stats["weekend"],
+            averages["weekend"],
             self.weekend_bedtime_label,
             self.weekend_wakeup_label,
             self.weekend_sleep_duration_label,
         )
         update_labels_for_category(
             "Overall",
-            stats["all"],
+            averages["all"],
             self.overall_bedtime_label,
             self.overall_wakeup_label,
             self.overall_sleep_duration_label,
@@ -569,19 +754,19 @@ class SleepDiary(QWidget):
         def style_duration_label(label, avg_dur_secs):
             """Apply red/green highlight to average sleep duration label based on 7–9h range."""
             if avg_dur_secs is None:
-                label.setStyleSheet("")
+                self._set_style_sheet(label, "")
                 return
             if (
                 avg_dur_secs < self.reccomended_seconds_min_sleep
                 or avg_dur_secs > self.reccomended_seconds_max_sleep
             ):
-                label.setStyleSheet(f"color: {calories_burned_red};")
+                self._set_style_sheet(label, f"color: {calories_burned_red};")
             else:
-                label.setStyleSheet(f"color: {hover_light_green};")
+                self._set_style_sheet(label, f"color: {hover_light_green};")
 
-        avg_weekday = sum(stats["weekday"]["dur"]) / len(stats["weekday"]["dur"]) if stats["weekday"]["dur"] else None
-        avg_weekend = sum(stats["weekend"]["dur"]) / len(stats["weekend"]["dur"]) if stats["weekend"]["dur"] else None
-        avg_overall = sum(stats["all"]["dur"]) / len(stats["all"]["dur"]) if stats["all"]["dur"] else None
+        avg_weekday = averages["weekday"][2] if averages["weekday"] else None
+        avg_weekend = averages["weekend"][2] if averages["weekend"] else None
+        avg_overall = averages["all"][2] if averages["all"] else None
 
         style_duration_label(self.weekday_sleep_duration_label, avg_weekday)
         style_duration_label(self.weekend_sleep_duration_label, avg_weekend)
@@ -590,10 +775,9 @@ class SleepDiary(QWidget):
         # Compute streak since last insufficient night (within this timeframe)
         streak = 0
         for row in reversed(rows):
-            duration_qtime = QTime.fromString(row[4], "HH:mm")
-            if not duration_qtime.isValid():
+            dur_secs = time_to_seconds(row[4])
+            if dur_secs is None:
                 break
-            dur_secs = duration_qtime.hour() * 3600 + duration_qtime.minute() * 60
             if (
                 dur_secs < self.reccomended_seconds_min_sleep
                 or dur_secs > self.reccomended_seconds_max_sleep
@@ -605,12 +789,9 @@ class SleepDiary(QWidget):
         )
 
         # Compute % of 24h spent sleeping for the current timeframe
-        total_sleep_secs = sum(stats["all"]["dur"]) if stats["all"]["dur"] else 0
-        nights_with_entries = len(stats["all"]["dur"])
-        if nights_with_entries > 0:
+        if avg_overall is not None:
             # Interpret as average % of a 24h day spent sleeping on nights with entries
-            avg_sleep_secs_per_night = total_sleep_secs / nights_with_entries
-            percent_of_day = (avg_sleep_secs_per_night / (24 * 3600)) * 100
+            percent_of_day = (avg_overall / (24 * 3600)) * 100
             self.percent_of_day_sleep_label.setText(
                 f"Average % of 24h spent sleeping: {percent_of_day:.1f}%"
             )
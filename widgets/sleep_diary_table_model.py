@@ -0,0 +1,227 @@
+"""
+SleepDiaryTableModel for the Health App.
+"""
+from bisect import bisect_right
+from functools import lru_cache
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate
+from PyQt6.QtGui import QBrush, QColor
+from config import calories_burned_red, hover_light_green
+from utils import time_to_seconds
+
+
+@lru_cache(maxsize=4096)
+def _display_date(sleep_date: str) -> str:
+    """
+    Convert a "yyyy-MM-dd" date from the database to the "dd-MM-yyyy" format shown in the table.
+    Cached as the view asks for the same cells on every repaint and reload.
+
+    Args:
+        sleep_date (str): The date in "yyyy-MM-dd" format.
+
+    Returns:
+        str: The date in "dd-MM-yyyy" format, or the original string if it can't be parsed.
+    """
+    qdate = QDate.fromString(sleep_date, "yyyy-MM-dd")
+    # Fallback if date format is unexpected
+    return qdate.toString("dd-MM-yyyy") if qdate.isValid() else sleep_date
+
+
+class SleepDiaryTableModel(QAbstractTableModel):
+    """
+    Table model backing the sleep diary table.
+    Holds the raw (id, sleep_date, bedtime, wakeup, sleep_duration) rows from the database
+    and only formats the cells the view asks for, so reloading a long timeframe is a single
+    model reset rather than creating widget items for every cell.
+    """
+    HEADERS = ("Night", "Bedtime", "Wakeup", "Sleep Duration")
+
+    def __init__(self, min_sleep_seconds: int, max_sleep_seconds: int, parent=None):
+        """
+        Initialize the SleepDiaryTableModel with no rows.
+
+        Args:
+            min_sleep_seconds (int): The shortest sleep duration shown in green.
+            max_sleep_seconds (int): The longest sleep duration shown in green.
+            parent (QObject, optional): The parent object for this model.
+        """
+        super().__init__(parent)
+        self._rows = []
+        self.min_sleep_seconds = min_sleep_seconds
+        self.max_sleep_seconds = max_sleep_seconds
+        self._sufficient_brush = QBrush(QColor(hover_light_green))
+        self._insufficient_brush = QBrush(QColor(calories_burned_red))
+
+    def rowCount(self, parent=QModelIndex()):
+        """
+        Return the number of rows in the model.
+
+        Args:
+            parent (QModelIndex): Unused for a flat table; must be invalid.
+
+        Returns:
+            int: The number of rows.
+        """
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        """
+        Return the number of columns in the model.
+
+        Args:
+            parent (QModelIndex): Unused for a flat table; must be invalid.
+
+        Returns:
+            int: The number of columns.
+        """
+        if parent.isValid():
+            return 0
+        return len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        """
+        Return the column titles for the horizontal header.
+
+        Args:
+            section (int): The column or row number.
+            orientation (Qt.Orientation): Which header is asking.
+            role (Qt.ItemDataRole): The data role.
+
+        Returns:
+            str or None: The column title, or the default for row numbers and other roles.
+        """
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+
+    def flags(self, index):
+        """
+        Cells can be selected but not edited, as edits would only change the view and not the database.
+
+        Args:
+            index (QModelIndex): The cell.
+
+        Returns:
+            Qt.ItemFlag: The flags for the cell.
+        """
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        """
+        Return the value to show for a cell.
+
+        Args:
+            index (QModelIndex): The cell to read.
+            role (Qt.ItemDataRole): DisplayRole for the text, ForegroundRole and
+                TextAlignmentRole for the colour coded sleep duration column.
+
+        Returns:
+            The requested value, or None for other roles.
+        """
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if column == 0:
+                return _display_date(row[1])
+            return row[column + 1]
+
+        if column == 3:
+            if role == Qt.ItemDataRole.TextAlignmentRole:
+                return Qt.AlignmentFlag.AlignCenter
+            if role == Qt.ItemDataRole.ForegroundRole:
+                # Colour the duration based on the recommended range
+                duration_seconds = time_to_seconds(row[4])
+                if duration_seconds is None:
+                    return None
+                if self.min_sleep_seconds <= duration_seconds <= self.max_sleep_seconds:
+                    return self._sufficient_brush
+                return self._insufficient_brush
+        return None
+
+    def set_rows(self, rows: list):
+        """
+        Replace all rows in the model with a single reset.
+
+        Args:
+            rows (list): A list of (id, sleep_date, bedtime, wakeup, sleep_duration) tuples.
+        """
+        self.beginResetModel()
+        self._rows = list(rows)
+        self.endResetModel()
+
+    def insert_entry(self, entry: tuple):
+        """
+        Insert a single entry without resetting the model, keeping the rows ordered by night.
+
+        Args:
+            entry (tuple): An (id, sleep_date, bedtime, wakeup, sleep_duration) tuple.
+        """
+        # Insert after any entries for the same night, as the database returns them in insertion order
+        position = bisect_right(self._rows, entry[1], key=lambda row: row[1])
+        self.beginInsertRows(QModelIndex(), position, position)
+        self._rows.insert(position, entry)
+        self.endInsertRows()
+
+    def update_entry(self, row: int, entry: tuple):
+        """
+        Replace the entry in a row and repaint just that row.
+        The night must be unchanged so the row stays in order.
+
+        Args:
+            row (int): The row number.
+            entry (tuple): The new (id, sleep_date, bedtime, wakeup, sleep_duration) tuple.
+        """
+        self._rows[row] = entry
+        self.dataChanged.emit(self.index(row, 0), self.index(row, self.columnCount() - 1))
+
+    def remove_rows(self, rows: list):
+        """
+        Remove rows without resetting the model.
+
+        Args:
+            rows (list): The row numbers to remove.
+        """
+        # Remove from the bottom up so the remaining row numbers stay valid
+        for row in sorted(set(rows), reverse=True):
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._rows[row]
+            self.endRemoveRows()
+
+    def entries(self) -> list:
+        """
+        Get all the database rows shown in the table, in display order.
+
+        Returns:
+            list: The (id, sleep_date, bedtime, wakeup, sleep_duration) tuples.
+        """
+        return list(self._rows)
+
+    def entry(self, row: int) -> tuple:
+        """
+        Get the database row shown in a table row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            tuple: The (id, sleep_date, bedtime, wakeup, sleep_duration) tuple for that row.
+        """
+        return self._rows[row]
+
+    def entry_id(self, row: int) -> int:
+        """
+        Get the id of the entry shown in a table row.
+
+        Args:
+            row (int): The row number.
+
+        Returns:
+            int: The id of the sleep diary entry in that row.
+        """
+        return self._rows[row][0]